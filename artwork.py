@@ -0,0 +1,147 @@
+import hashlib
+import os
+import threading
+import metrics
+from PyQt5 import QtCore as qtc
+from PyQt5 import QtGui as qtg
+from models import db_dir, PodcastDB, ArtworkDB
+
+art_dir = os.path.join(db_dir, 'art')
+
+# Width in pixels of the copy kept for each place artwork is shown,
+# None keeps the original
+TIERS = {'library': 130, 'about': 250, 'player': None}
+
+# Seconds to wait for an artwork host to connect or send more data
+ARTWORK_TIMEOUT = 30
+
+
+class ArtworkCache:
+    """
+    Artwork files stored under ~/.kodkast/art by a hash of their content,
+    with pre-scaled copies for the library and about views so the full
+    size image only has to be decoded for the player.
+
+    Files are touched whenever they are used, and the least recently used
+    ones are deleted once the cache grows past max_bytes.
+    """
+
+    def __init__(self, directory=art_dir, max_bytes=200 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.total_bytes = None
+
+    def store(self, data):
+        """Add image data to the cache and return its key."""
+        key = hashlib.sha256(data).hexdigest()[:32]
+        original = self._path(key, 'player')
+        if not os.path.isfile(original):
+            os.makedirs(os.path.dirname(original), exist_ok=True)
+            with open(original + '.tmp', 'wb') as art_file:
+                art_file.write(data)
+            os.replace(original + '.tmp', original)
+            self._added(len(data))
+        return key
+
+    def fetch(self, url, headers=None):
+        """
+        Return the key of the artwork at url, downloading it only if it
+        isn't already cached.
+        """
+        known = ArtworkDB.get_or_none(ArtworkDB.url == url)
+        if known and os.path.isfile(self._path(known.key, 'player')):
+            metrics.count('artwork.hit')
+            return known.key
+        import ssl
+        import urllib.request
+        request = urllib.request.Request(url, None, headers or {})
+        with metrics.span('artwork.download'):
+            # Artwork hosts with broken certificates are accepted
+            key = self.store(urllib.request.urlopen(request, timeout=ARTWORK_TIMEOUT,
+                                                    context=ssl._create_unverified_context()).read())
+        ArtworkDB.insert(url=url, key=key).on_conflict_replace().execute()
+        return key
+
+    def cached_path(self, key, tier):
+        """
+        Return the file holding the artwork for key at the size for tier
+        if it has already been scaled, or None. Never decodes an image,
+        so it is cheap enough for the GUI thread.
+        """
+        tier_path = self._path(key, tier)
+        if os.path.isfile(tier_path):
+            os.utime(tier_path)
+            return tier_path
+        return None
+
+    def path(self, key, tier):
+        """
+        Return the file holding the artwork for key at the size for tier,
+        scaling it down on first use, or None if it is not cached.
+        """
+        tier_path = self.cached_path(key, tier)
+        if tier_path:
+            return tier_path
+        tier_path = self._path(key, tier)
+        original = self._path(key, 'player')
+        if not os.path.isfile(original):
+            return None
+        os.utime(original)
+        with metrics.span('artwork.scale', tier=tier):
+            image = qtg.QImage(original)
+            if image.isNull():
+                return original
+            width = TIERS[tier]
+            scaled = image.scaled(width, width, qtc.Qt.KeepAspectRatio, qtc.Qt.SmoothTransformation)
+            scaled.save(tier_path + '.tmp', 'PNG')
+        os.replace(tier_path + '.tmp', tier_path)
+        self._added(os.path.getsize(tier_path))
+        return tier_path
+
+    def _path(self, key, tier):
+        if TIERS[tier] is None:
+            name = key
+        else:
+            name = '{}-{}.png'.format(key, TIERS[tier])
+        return os.path.join(self.directory, key[:2], name)
+
+    def _files(self):
+        for root, dirs, files in os.walk(self.directory):
+            for name in files:
+                yield os.path.join(root, name)
+
+    def _added(self, size):
+        with self.lock:
+            if self.total_bytes is None:
+                self.total_bytes = sum(os.path.getsize(path) for path in self._files())
+            else:
+                self.total_bytes += size
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # Trim to 90% of the limit so every new file doesn't trigger another scan
+        target = self.max_bytes * 0.9
+        for path in sorted(self._files(), key=os.path.getmtime):
+            if self.total_bytes <= target:
+                break
+            size = os.path.getsize(path)
+            os.remove(path)
+            self.total_bytes -= size
+
+
+def convert_rendered(cache):
+    """
+    Move artwork stored as base64 in PodcastDB.rendered by older versions
+    into the cache, then shrink the database file.
+    """
+    import base64
+    converted = False
+    for podcast in PodcastDB.select().where(PodcastDB.rendered != ""):
+        podcast.art_key = cache.store(base64.b64decode(podcast.rendered))
+        podcast.rendered = ""
+        podcast.save(only=[PodcastDB.art_key, PodcastDB.rendered])
+        converted = True
+    if converted:
+        PodcastDB._meta.database.execute_sql('VACUUM')
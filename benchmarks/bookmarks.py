@@ -0,0 +1,54 @@
+"""
+Time recording playback positions in a BookmarkJournal as the player
+does every half second, and the write of a thousand pending positions,
+then check that positions recorded just before stop() are written.
+"""
+import os
+import tempfile
+import time
+import synthetic  # puts the app's modules on sys.path
+
+import bookmarks
+import models
+from models import PodcastDB, EpisodeDB
+
+EPISODES = 1000
+RECORDS = 100000
+
+
+def run():
+    # The writer's transactions are on models.database, so that is what is
+    # pointed at a temp file rather than binding the models to another one
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        models.database.init(os.path.join(tmp_dir, 'bench.db'), pragmas=models.database_pragmas())
+        models.migrate_database()
+        podcast = PodcastDB.create(title="Synthetic Podcast", url="", image="")
+        ids = [EpisodeDB.create(podcast=podcast, title="Episode {}".format(i), pub_date="2020-01-01",
+                                url="http://localhost/{}.mp3".format(i), guid=str(i), image="", bookmark=0).id
+               for i in range(EPISODES)]
+        journal = bookmarks.BookmarkJournal(interval=3600)
+
+        start = time.perf_counter()
+        for i in range(RECORDS):
+            journal.record(ids[i % EPISODES], i)
+        record = (time.perf_counter() - start) / RECORDS
+
+        start = time.perf_counter()
+        journal._write()
+        write = time.perf_counter() - start
+
+        # Many times over, as the writer can be anywhere in its loop when stop() comes
+        for position in range(50):
+            journal.start()
+            journal.record(ids[0], position)
+            journal.stop()
+            assert EpisodeDB.get_by_id(ids[0]).bookmark == position, "a position recorded before stop() was lost"
+        models.close_database()
+
+    print("{:<32} {:>8.2f} µs".format("record", record * 1e6))
+    print("{:<32} {:>8.2f} ms".format("write {} positions".format(EPISODES), write * 1000))
+    print("positions recorded before stop() were written")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,35 @@
+"""
+Time feed refreshes against a local server: the first download, a
+refresh answered with 304 Not Modified, and a refresh from a host
+without validators where the content hash short-circuits parsing.
+"""
+import time
+from server import FeedServer
+from synthetic import make_feed, temp_database
+
+import feeds
+from models import PodcastDB
+
+
+def timed_refresh(podcast):
+    start = time.perf_counter()
+    inserted, updated, deleted = feeds.refresh_podcast(podcast)
+    return time.perf_counter() - start, len(inserted)
+
+
+def run(size=5000):
+    feed = make_feed(size)
+    for validators in (True, False):
+        with FeedServer(validators=validators) as server, temp_database():
+            server.add('/feed.xml', feed)
+            podcast = PodcastDB.create(title="Synthetic Podcast", url=server.url('/feed.xml'),
+                                       image="http://localhost/cover.jpg")
+            first, first_new = timed_refresh(podcast)
+            again, again_new = timed_refresh(podcast)
+            assert first_new == size and again_new == 0
+            label = "304 Not Modified" if validators else "matching content hash"
+            print("first refresh {:.3f} s, refresh with {} {:.3f} s".format(first, label, again))
+
+
+if __name__ == '__main__':
+    run()
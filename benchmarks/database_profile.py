@@ -0,0 +1,79 @@
+"""
+Report the latency of single bookmark writes while other threads keep
+reading the episode list, with SQLite's default rollback journal and
+with the profile from models.database_pragmas.
+"""
+import os
+import statistics
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+import synthetic
+
+import peewee
+import models
+from models import PodcastDB, EpisodeDB
+
+
+def fill(db, episode_count):
+    with db.atomic():
+        podcast = PodcastDB.create(title="Synthetic Podcast", url="http://localhost/feed.xml", image="")
+        rows = [{'podcast': podcast.id, 'title': "Episode {}".format(i), 'pub_date': date(2000, 1, 1) + timedelta(i),
+                 'url': "http://localhost/{}.mp3".format(i), 'guid': str(i), 'image': "", 'bookmark': 0}
+                for i in range(episode_count)]
+        for batch in peewee.chunked(rows, 100):
+            EpisodeDB.insert_many(batch).execute()
+    return podcast
+
+
+def reader(db, podcast, stop):
+    with db.connection_context():
+        while not stop.is_set():
+            list(EpisodeDB.select().where(EpisodeDB.podcast == podcast).order_by(EpisodeDB.pub_date.desc())
+                 .tuples())
+
+
+def measure(db, readers, writes, episode_count):
+    with db.bind_ctx(models.MODELS):
+        models.migrate_database()
+        podcast = fill(db, episode_count)
+        episode_ids = [episode.id for episode in EpisodeDB.select(EpisodeDB.id)]
+        stop = threading.Event()
+        threads = [threading.Thread(target=reader, args=(db, podcast, stop)) for i in range(readers)]
+        for thread in threads:
+            thread.start()
+        latencies = []
+        try:
+            for i in range(writes):
+                start = time.perf_counter()
+                EpisodeDB.update(bookmark=i).where(EpisodeDB.id == episode_ids[i % len(episode_ids)]).execute()
+                latencies.append((time.perf_counter() - start) * 1000)
+                # Writes come from the player, not back to back
+                time.sleep(0.005)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+        db.close()
+    latencies.sort()
+    return (statistics.median(latencies), latencies[int(len(latencies) * 0.95)], latencies[-1])
+
+
+def run(readers=4, writes=200, episode_count=5000):
+    profiles = [
+        ("rollback journal (default)", {}),
+        ("WAL, synchronous=normal", {'pragmas': models.database_pragmas(),
+                                     'timeout': models.BUSY_TIMEOUT / 1000}),
+    ]
+    print("{} writes with {} reader threads on {} episodes, ms".format(writes, readers, episode_count))
+    print("{:<28} {:>8} {:>8} {:>8}".format("profile", "p50", "p95", "max"))
+    for name, options in profiles:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db = peewee.SqliteDatabase(os.path.join(tmp_dir, 'bench.db'), **options)
+            p50, p95, worst = measure(db, readers, writes, episode_count)
+        print("{:<28} {:>8.2f} {:>8.2f} {:>8.2f}".format(name, p50, p95, worst))
+
+
+if __name__ == '__main__':
+    run()
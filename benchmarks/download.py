@@ -0,0 +1,49 @@
+"""
+Download a large synthetic episode from a local Range-capable server,
+first in one go and then with the connection dropped half way, and
+report throughput and the downloader's peak Python memory use.
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+from server import FeedServer
+import synthetic  # puts the app's modules on sys.path
+
+import requests
+import downloads
+
+
+def run(size_mb=200):
+    body = os.urandom(1024 * 1024) * size_mb
+    with FeedServer() as server, tempfile.TemporaryDirectory() as tmp_dir:
+        server.add('/episode.mp3', body, 'audio/mpeg')
+        url = server.url('/episode.mp3')
+
+        local_file = os.path.join(tmp_dir, 'episode.mp3')
+        tracemalloc.start()
+        start = time.perf_counter()
+        downloads.download_file(url, local_file)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert os.path.getsize(local_file) == len(body)
+        print("{} MB in {:.2f} s ({:.0f} MB/s), peak traced memory {:.1f} MB".format(
+            size_mb, elapsed, size_mb / elapsed, peak / 1e6))
+
+        resumed_file = os.path.join(tmp_dir, 'resumed.mp3')
+        server.drop_once('/episode.mp3', len(body) // 2)
+        try:
+            downloads.download_file(url, resumed_file)
+        except requests.RequestException:
+            pass
+        partial = os.path.getsize(resumed_file + downloads.PART_SUFFIX)
+        downloads.download_file(url, resumed_file)
+        with open(resumed_file, 'rb') as resumed:
+            assert resumed.read() == body
+        print("interrupted after {:.0f} MB, resumed with a Range request and completed intact".format(
+            partial / 1e6))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,73 @@
+"""
+Drain a DownloadQueue of synthetic episodes from a local server under a
+global bandwidth cap, and report the achieved rate and the order in
+which episodes finished. Then check that queueing an episode whose
+download failed tries it again.
+"""
+import os
+import tempfile
+import threading
+import time
+from server import FeedServer
+from synthetic import temp_database
+
+import downloads
+from models import PodcastDB, EpisodeDB
+
+
+def run(episode_count=10, episode_mb=5, workers=3, cap_mb=20):
+    body = os.urandom(episode_mb * 1000 * 1000)
+    finished = []
+    all_done = threading.Event()
+
+    def on_finished(episode_id):
+        finished.append(episode_id)
+        if len(finished) == episode_count:
+            all_done.set()
+
+    with FeedServer() as server, temp_database(), tempfile.TemporaryDirectory() as tmp_dir:
+        downloads.db_dir = tmp_dir
+        podcast = PodcastDB.create(title="Synthetic Podcast", url="", image="")
+        for i in range(episode_count):
+            server.add('/episode-{}.mp3'.format(i), body, 'audio/mpeg')
+            url = server.url('/episode-{}.mp3'.format(i))
+            EpisodeDB.create(podcast=podcast, title="Episode {}".format(i), pub_date="2020-01-{:02d}".format(i + 1),
+                             url=url, guid=url, image="", bookmark=0)
+        queue = downloads.DownloadQueue(workers=workers, bytes_per_second=cap_mb * 1000 * 1000,
+                                        on_finished=on_finished)
+        for episode in EpisodeDB.select():
+            queue.add(episode, downloads.PRIORITY_HIGH if episode.title == "Episode 9" else downloads.PRIORITY_NORMAL)
+        start = time.perf_counter()
+        queue.start()
+        all_done.wait()
+        elapsed = time.perf_counter() - start
+        queue.stop()
+        retry_failed(server, podcast)
+    total_mb = episode_count * episode_mb
+    print("{} MB with {} workers under a {} MB/s cap: {:.2f} s ({:.1f} MB/s)".format(
+        total_mb, workers, cap_mb, elapsed, total_mb / elapsed))
+    print("finish order (episode ids):", finished)
+
+
+def retry_failed(server, podcast):
+    url = server.url('/missing.mp3')
+    episode = EpisodeDB.create(podcast=podcast, title="Missing", pub_date="2020-02-01", url=url, guid=url,
+                               image="", bookmark=0)
+    ended = threading.Event()
+    queue = downloads.DownloadQueue(workers=1, on_finished=lambda episode_id: ended.set(),
+                                    on_failed=lambda episode_id, error: ended.set())
+    queue.start()
+    queue.add(episode)
+    ended.wait()
+    assert not queue.is_queued(episode) and downloads.downloaded_path(episode) is None
+    server.add('/missing.mp3', b'\0' * 1000, 'audio/mpeg')
+    ended.clear()
+    queue.add(episode)
+    ended.wait()
+    queue.stop()
+    assert downloads.downloaded_path(episode), "a failed download wasn't tried again"
+    print("a failed download was tried again when queued")
+
+
+if __name__ == '__main__':
+    run()
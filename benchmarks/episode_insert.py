@@ -0,0 +1,38 @@
+"""
+Report episode insert throughput into a temporary SQLite file.
+
+Compares one EpisodeDB.create() per row, which commits every row, with
+the batched insert path used by feeds.merge_episodes.
+"""
+import io
+import time
+from synthetic import make_feed, temp_database
+
+import feeds
+from models import PodcastDB, EpisodeDB
+
+
+def per_row(podcast, items):
+    for item in items:
+        EpisodeDB.create(podcast=PodcastDB.get(PodcastDB.title == podcast.title), bookmark=0, **item)
+
+
+def batched(podcast, items):
+    feeds.merge_episodes(podcast, items)
+
+
+def run(size=2000):
+    items = list(feeds.iter_episodes(io.BytesIO(make_feed(size)), "http://localhost/cover.jpg"))
+    for name, insert in [("per-row create", per_row), ("batched insert_many", batched)]:
+        with temp_database():
+            podcast = PodcastDB.create(title="Synthetic Podcast", url="http://localhost/feed.xml",
+                                       image="http://localhost/cover.jpg")
+            start = time.perf_counter()
+            insert(podcast, items)
+            elapsed = time.perf_counter() - start
+            assert EpisodeDB.select().count() == size
+        print("{:<20} {:>8.3f} s {:>12.0f} rows/s".format(name, elapsed, size / elapsed))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,79 @@
+"""
+Time episode search over a library of 150 podcasts and 105,000 episodes
+with generated titles and show notes, as a search is typed one key at a
+time. Every keystroke should return its first page of results in under
+50 ms.
+"""
+import itertools
+import random
+import time
+from datetime import date, timedelta
+from synthetic import temp_database
+
+import peewee
+
+import search
+from models import PodcastDB, EpisodeDB
+
+BUDGET_MS = 50
+
+# The most common words come first, so some searches match most episodes
+COMMON_WORDS = "the of and a to in is interview history climate change".split()
+
+SEARCHES = ["interview", "climate change", "python web framework", "the history of", "zq"]
+
+
+def vocabulary(count, rng):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = {''.join(rng.choice(letters) for _ in range(rng.randint(3, 9))) for _ in range(count)}
+    words.update(["python", "web", "framework"])
+    words = sorted(words - set(COMMON_WORDS))
+    rng.shuffle(words)
+    return COMMON_WORDS + words
+
+
+def fill(db, podcast_count, episodes_per_podcast, rng):
+    words = vocabulary(20000, rng)
+    # Word frequencies roughly follow Zipf's law, as in real text
+    weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(words))))
+    for p in range(podcast_count):
+        podcast = PodcastDB.create(title="Podcast {}".format(p), url="http://localhost/{}.xml".format(p), image="")
+        rows = []
+        for e in range(episodes_per_podcast):
+            rows.append({'podcast': podcast.id, 'pub_date': date(2000, 1, 1) + timedelta(e),
+                         'title': ' '.join(rng.choices(words, cum_weights=weights, k=rng.randint(3, 10))),
+                         'description': ' '.join(rng.choices(words, cum_weights=weights, k=rng.randint(30, 150))),
+                         'url': "http://localhost/{}/{}.mp3".format(p, e), 'guid': str(e), 'image': "",
+                         'bookmark': 0})
+        with db.atomic():
+            for batch in peewee.chunked(rows, 100):
+                EpisodeDB.insert_many(batch).execute()
+            search.index_episodes(EpisodeDB.podcast == podcast)
+
+
+def run(podcast_count=150, episodes_per_podcast=700):
+    rng = random.Random(1)
+    with temp_database() as db:
+        start = time.perf_counter()
+        fill(db, podcast_count, episodes_per_podcast, rng)
+        print("{} episodes indexed in {:.1f} s".format(podcast_count * episodes_per_podcast,
+                                                        time.perf_counter() - start))
+        print("{:<24} {:>6} {:>10} {:>10}  {}".format("search", "keys", "median ms", "max ms", "slowest"))
+        over = 0
+        for text in SEARCHES:
+            times = []
+            for end in range(1, len(text) + 1):
+                start = time.perf_counter()
+                search.search_episodes(text[:end])
+                times.append(((time.perf_counter() - start) * 1000, text[:end]))
+            times.sort()
+            median = times[len(times) // 2][0]
+            slowest_ms, slowest = times[-1]
+            over += sum(1 for ms, _ in times if ms > BUDGET_MS)
+            print("{:<24} {:>6} {:>10.1f} {:>10.1f}  {!r}".format(repr(text), len(times), median, slowest_ms,
+                                                                  slowest))
+        print("{} keystrokes over {} ms".format(over, BUDGET_MS))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,89 @@
+"""
+Time to open the episode list of a podcast with 10,000 episodes, from
+the query to the first paint, rebuilding a QTableWidget row by row as
+refresh_episode_list used to, and with EpisodeTableModel in a QTableView.
+
+Run with QT_QPA_PLATFORM=offscreen on a machine without a display.
+"""
+import os
+import time
+from datetime import date, timedelta
+from synthetic import qt_application, temp_database
+
+import peewee
+from PyQt5 import QtGui as qtg
+from PyQt5 import QtWidgets as qtw
+
+import episodemodel
+from models import db_dir, PodcastDB, EpisodeDB
+
+
+def fill(episode_count):
+    podcast = PodcastDB.create(title="Synthetic Podcast", url="http://localhost/feed.xml", image="")
+    rows = [{'podcast': podcast.id, 'title': "Episode {}".format(i), 'pub_date': date(2000, 1, 1) + timedelta(i),
+             'url': "http://localhost/{}.mp3".format(i), 'guid': str(i), 'image': "", 'bookmark': 0}
+            for i in range(episode_count)]
+    for batch in peewee.chunked(rows, 100):
+        EpisodeDB.insert_many(batch).execute()
+    return podcast
+
+
+def table_widget(podcast):
+    table = qtw.QTableWidget()
+    table.setColumnCount(2)
+    table.setHorizontalHeaderLabels(['Date', 'Title'])
+    table.verticalHeader().setVisible(False)
+    table.resize(355, 600)
+    query = EpisodeDB.select().where(EpisodeDB.podcast == podcast).order_by(EpisodeDB.pub_date.desc())
+    pod_dir = os.path.join(db_dir, podcast.title)
+    today = date.today()
+    for episode in query:
+        row = table.rowCount()
+        table.setRowCount(row + 1)
+        downloaded = os.path.isfile(os.path.join(pod_dir, episode.url.split('/')[-1]))
+        if episode.pub_date == today:
+            date_text = "Today"
+        elif episode.pub_date == today - timedelta(days=1):
+            date_text = "Yesterday"
+        else:
+            date_text = episode.pub_date.strftime("%m-%d-%Y")
+        for col, text in enumerate([date_text, episode.title]):
+            cell = qtw.QTableWidgetItem(text)
+            if downloaded:
+                cell.setForeground(qtg.QColor("green"))
+            table.setItem(row, col, cell)
+    table.resizeColumnsToContents()
+    table.grab()
+
+
+def table_view(podcast):
+    model = episodemodel.EpisodeTableModel(podcast)
+    table = qtw.QTableView()
+    table.setModel(model)
+    table.horizontalHeader().resizeSection(0, table.fontMetrics().horizontalAdvance("00-00-0000") + 12)
+    table.horizontalHeader().setStretchLastSection(True)
+    table.verticalHeader().setVisible(False)
+    table.resize(355, 600)
+    table.grab()
+    return model
+
+
+def run(episode_count=10000):
+    qt_application()
+    with temp_database():
+        podcast = fill(episode_count)
+        start = time.perf_counter()
+        table_widget(podcast)
+        widget_time = time.perf_counter() - start
+        start = time.perf_counter()
+        model = table_view(podcast)
+        view_time = time.perf_counter() - start
+
+    print("{} episodes".format(episode_count))
+    print("{:<28} {:>8.1f} ms".format("QTableWidget rebuild", widget_time * 1000))
+    print("{:<28} {:>8.1f} ms ({} of {} rows read)".format("EpisodeTableModel", view_time * 1000,
+                                                          len(model.rows), episode_count))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,33 @@
+"""
+Time feeds.merge_episodes on synthetic feeds of increasing size.
+
+Each size is merged into an empty podcast (first subscribe) and then
+merged again with the same items (refresh). Time per item should stay
+roughly constant as the feed grows.
+"""
+import io
+import time
+from synthetic import make_feed, temp_database
+
+import feeds
+from models import PodcastDB
+
+
+def run(sizes=(625, 1250, 2500, 5000)):
+    print("{:>6} {:>12} {:>12} {:>14}".format("items", "subscribe s", "refresh s", "refresh us/item"))
+    for size in sizes:
+        items = list(feeds.iter_episodes(io.BytesIO(make_feed(size)), "http://localhost/cover.jpg"))
+        with temp_database():
+            podcast = PodcastDB.create(title="Synthetic Podcast", url="http://localhost/feed.xml",
+                                       image="http://localhost/cover.jpg")
+            start = time.perf_counter()
+            feeds.merge_episodes(podcast, items)
+            subscribe = time.perf_counter() - start
+            start = time.perf_counter()
+            feeds.merge_episodes(podcast, items)
+            refresh = time.perf_counter() - start
+        print("{:>6} {:>12.3f} {:>12.3f} {:>14.1f}".format(size, subscribe, refresh, refresh / size * 1e6))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,71 @@
+"""
+Compare peak memory and throughput of the streaming feed parser with
+the previous whole-document BeautifulSoup parser.
+
+Each parser runs in a fresh interpreter so its peak RSS is measured on
+its own. The feed is read from a file, like a streamed HTTP response.
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from synthetic import make_feed
+
+import feeds
+
+
+def parse_with_bs4(path):
+    from bs4 import BeautifulSoup
+    from dateutil import parser
+    with open(path, 'rb') as feed_file:
+        feed = BeautifulSoup(feed_file.read(), 'lxml-xml')
+    items = []
+    for episode in feed.find_all('item'):
+        items.append({
+            'title': episode.title.text,
+            'url': episode.enclosure['url'],
+            'pub_date': parser.parse(episode.pubDate.text).date(),
+        })
+    return len(items)
+
+
+def parse_with_iterparse(path):
+    with open(path, 'rb') as feed_file:
+        return sum(1 for _ in feeds.iter_episodes(feed_file))
+
+
+def measure(method, path):
+    parse = {'bs4': parse_with_bs4, 'iterparse': parse_with_iterparse}[method]
+    start = time.perf_counter()
+    count = parse(path)
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        peak //= 1024
+    print(json.dumps({'items': count, 'seconds': elapsed, 'peak_kb': peak}))
+
+
+def run(item_count=50000):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'feed.xml')
+        with open(path, 'wb') as feed_file:
+            feed_file.write(make_feed(item_count))
+        size_mb = os.path.getsize(path) / 1e6
+        print("{:.1f} MB feed, {} items".format(size_mb, item_count))
+        for method in ('bs4', 'iterparse'):
+            output = subprocess.check_output([sys.executable, __file__, method, path])
+            result = json.loads(output)
+            print("{:<10} {:>7.2f} s {:>8.1f} MB/s {:>8.0f} items/s {:>8.1f} MB peak RSS".format(
+                method, result['seconds'], size_mb / result['seconds'],
+                result['items'] / result['seconds'], result['peak_kb'] / 1024))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3:
+        measure(sys.argv[1], sys.argv[2])
+    else:
+        run()
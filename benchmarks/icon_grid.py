@@ -0,0 +1,80 @@
+"""
+Time to first paint of a Top 100 grid on a cold artwork cache, against
+a local server adding 50 ms of latency to every image.
+
+Compares downloading every image one after another before showing the
+list with QIconGrid, which paints placeholders first and then fetches
+only the artwork in view. Run with QT_QPA_PLATFORM=offscreen on a
+machine without a display.
+"""
+import tempfile
+import time
+import urllib.request
+from library_render import make_image
+from server import FeedServer
+from synthetic import qt_application, temp_database
+
+from PyQt5 import QtCore as qtc
+from PyQt5 import QtGui as qtg
+from PyQt5 import QtWidgets as qtw
+
+import artwork
+import tasks
+from kodkast import QIconGrid
+
+
+def sequential(urls):
+    grid = qtw.QListWidget()
+    grid.setViewMode(qtw.QListView.IconMode)
+    grid.setIconSize(qtc.QSize(130, 130))
+    grid.resize(355, 600)
+    for i, url in enumerate(urls):
+        podcast_pmap = qtg.QPixmap()
+        podcast_pmap.loadFromData(urllib.request.urlopen(url).read())
+        this_podcast = qtw.QListWidgetItem("Podcast {}".format(i), grid)
+        this_podcast.setIcon(qtg.QIcon(podcast_pmap))
+    grid.grab()
+
+
+def lazy(urls, cache):
+    task_manager = tasks.TaskManager()
+
+    def fetch_icon(task, url):
+        return cache.path(cache.fetch(url), 'library')
+
+    grid = QIconGrid(task_manager, fetch_icon)
+    grid.resize(355, 600)
+    start = time.perf_counter()
+    for i, url in enumerate(urls):
+        grid.add_podcast("Podcast {}".format(i), url)
+    grid.grab()
+    first_paint = time.perf_counter() - start
+
+    # Wait for the artwork in view to arrive
+    qtw.QApplication.processEvents()
+    while task_manager.running():
+        qtw.QApplication.processEvents(qtc.QEventLoop.AllEvents, 50)
+    grid.grab()
+    return first_paint, time.perf_counter() - start, len(grid.requested)
+
+
+def run(count=100, latency=0.05):
+    qt_application()
+    with FeedServer(latency=latency) as server:
+        urls = []
+        for i in range(count):
+            server.add('/art/{}.jpg'.format(i), make_image(i, 600), 'image/jpeg')
+            urls.append(server.url('/art/{}.jpg'.format(i)))
+
+        start = time.perf_counter()
+        sequential(urls)
+        print("{:<32} {:>8.3f} s".format("sequential, first paint", time.perf_counter() - start))
+
+        with temp_database(), tempfile.TemporaryDirectory() as art_dir:
+            first_paint, loaded, fetched = lazy(urls, artwork.ArtworkCache(art_dir))
+        print("{:<32} {:>8.3f} s".format("QIconGrid, first paint", first_paint))
+        print("{:<32} {:>8.3f} s ({} of {} fetched)".format("QIconGrid, visible artwork", loaded, fetched, count))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,107 @@
+"""
+Compare rendering a 200 podcast library from base64 images stored in
+PodcastDB.rendered with rendering it from the artwork cache's 130px
+thumbnails, and report the size of the database file in each case.
+
+Run with QT_QPA_PLATFORM=offscreen on a machine without a display.
+"""
+import base64
+import os
+import random
+import tempfile
+import time
+from synthetic import qt_application, temp_database
+
+from PyQt5 import QtCore as qtc
+from PyQt5 import QtGui as qtg
+from PyQt5 import QtWidgets as qtw
+
+import artwork
+from models import PodcastDB
+
+
+def make_image(seed, size=1400):
+    """Return JPEG data for a cover image that differs for every seed."""
+    rng = random.Random(seed)
+    image = qtg.QImage(size, size, qtg.QImage.Format_RGB32)
+    painter = qtg.QPainter(image)
+    gradient = qtg.QLinearGradient(0, 0, size, size)
+    gradient.setColorAt(0, qtg.QColor(rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+    gradient.setColorAt(1, qtg.QColor(rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+    painter.fillRect(0, 0, size, size, gradient)
+    for i in range(200):
+        painter.setPen(qtg.QColor(rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+        painter.drawEllipse(rng.randrange(size), rng.randrange(size), rng.randrange(400), rng.randrange(400))
+    painter.setFont(qtg.QFont('Sans', 120))
+    painter.drawText(image.rect(), qtc.Qt.AlignCenter, "Podcast {}".format(seed))
+    painter.end()
+    data = qtc.QByteArray()
+    buffer = qtc.QBuffer(data)
+    buffer.open(qtc.QIODevice.WriteOnly)
+    image.save(buffer, 'JPEG', 90)
+    return bytes(data)
+
+
+def library_widget():
+    widget = qtw.QListWidget()
+    widget.setViewMode(qtw.QListView.IconMode)
+    widget.setIconSize(qtc.QSize(130, 130))
+    widget.setUniformItemSizes(True)
+    widget.resize(355, 600)
+    return widget
+
+
+def render_base64(widget):
+    for podcast in PodcastDB.select():
+        podcast_pmap = qtg.QPixmap()
+        podcast_pmap.loadFromData(base64.b64decode(podcast.rendered))
+        item = qtw.QListWidgetItem(podcast.title, widget)
+        item.setIcon(qtg.QIcon(podcast_pmap))
+    widget.grab()
+
+
+def render_cached(widget, cache):
+    for podcast in PodcastDB.select():
+        item = qtw.QListWidgetItem(podcast.title, widget)
+        item.setIcon(qtg.QIcon(cache.path(podcast.art_key, 'library')))
+    widget.grab()
+
+
+def run(count=200):
+    qt_application()
+    images = [make_image(i) for i in range(count)]
+    print("{} podcasts, {:.0f} KB of artwork on average".format(
+        count, sum(len(image) for image in images) / count / 1024))
+
+    with temp_database() as db:
+        for i, image in enumerate(images):
+            PodcastDB.create(title="Podcast {}".format(i), url="http://localhost/{}.xml".format(i),
+                             image="http://localhost/{}.jpg".format(i), rendered=base64.b64encode(image))
+        base64_size = os.path.getsize(db.database)
+        widget = library_widget()
+        start = time.perf_counter()
+        render_base64(widget)
+        base64_time = time.perf_counter() - start
+
+        with tempfile.TemporaryDirectory() as art_dir:
+            cache = artwork.ArtworkCache(art_dir)
+            artwork.convert_rendered(cache)
+            cached_size = os.path.getsize(db.database)
+            # The first render scales the originals, later renders only read thumbnails
+            start = time.perf_counter()
+            render_cached(library_widget(), cache)
+            first_time = time.perf_counter() - start
+            start = time.perf_counter()
+            render_cached(library_widget(), cache)
+            cached_time = time.perf_counter() - start
+        db.close()
+
+    print("{:<28} {:>8.3f} s {:>10.1f} MB database".format("base64 in PodcastDB", base64_time,
+                                                           base64_size / 1024 / 1024))
+    print("{:<28} {:>8.3f} s {:>10.1f} MB database".format("artwork cache, first run", first_time,
+                                                           cached_size / 1024 / 1024))
+    print("{:<28} {:>8.3f} s".format("artwork cache", cached_time))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,56 @@
+"""
+Time the cost of instrumentation: a span around an empty block, written
+to the rotating log, a counter, and the summary the Diagnostics view
+reads, with four threads recording at once as the task pool and
+download workers do.
+"""
+import os
+import tempfile
+import threading
+import time
+import synthetic  # puts the app's modules on sys.path
+
+import metrics
+
+SPANS = 20000
+THREADS = 4
+
+
+def timed(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def empty_span():
+    with metrics.span('benchmark.span', podcast="Synthetic Podcast"):
+        pass
+
+
+def run():
+    with tempfile.TemporaryDirectory() as log_dir:
+        metrics.log_path = os.path.join(log_dir, 'metrics.jsonl')
+        span = timed(empty_span, SPANS)
+        counter = timed(lambda: metrics.count('benchmark.counter'), SPANS)
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=timed, args=(empty_span, SPANS // THREADS)) for _ in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        threaded = (time.perf_counter() - start) / SPANS
+
+        summary = timed(metrics.summary, 100)
+        logs = sorted(os.listdir(log_dir))
+
+    print("{:<32} {:>8.1f} µs".format("span", span * 1e6))
+    print("{:<32} {:>8.1f} µs".format("span, {} threads".format(THREADS), threaded * 1e6))
+    print("{:<32} {:>8.1f} µs".format("counter", counter * 1e6))
+    print("{:<32} {:>8.1f} µs".format("summary", summary * 1e6))
+    print("log files: {}".format(", ".join(logs)))
+
+
+if __name__ == '__main__':
+    run()
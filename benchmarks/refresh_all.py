@@ -0,0 +1,31 @@
+"""
+Time refresh.refresh_all over a library of synthetic podcasts served
+by a local server with per-request latency, sequentially and with the
+default worker pool.
+"""
+import time
+from server import FeedServer
+from synthetic import make_feed, temp_database
+
+import refresh
+from models import PodcastDB
+
+
+def run(podcast_count=150, items=200, latency=0.1):
+    for workers in (1, refresh.REFRESH_WORKERS):
+        with FeedServer(latency=latency) as server, temp_database():
+            for i in range(podcast_count):
+                path = '/feed-{}.xml'.format(i)
+                server.add(path, make_feed(items, title="Podcast {}".format(i)))
+                PodcastDB.create(title="Podcast {}".format(i), url=server.url(path), image="")
+            start = time.perf_counter()
+            # A single local host stands in for many, so lift the per-host limit
+            results = refresh.refresh_all(workers=workers, per_host=workers)
+            elapsed = time.perf_counter() - start
+            errors = [r for r in results.values() if isinstance(r, Exception)]
+            assert not errors, errors[0]
+        print("{:>2} workers: {} podcasts in {:.2f} s".format(workers, podcast_count, elapsed))
+
+
+if __name__ == '__main__':
+    run()
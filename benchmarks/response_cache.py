@@ -0,0 +1,62 @@
+"""
+Time repeat navigation through podcast details with the response cache,
+against a local server standing in for iTunes and the podcast hosts with
+200 ms of latency: the first visit to each podcast, a second visit while
+its responses are fresh, and a visit after they expire with the server
+shut down, which must still be answered from the cache.
+"""
+import json
+import time
+from server import FeedServer
+from synthetic import make_feed, temp_database
+
+import feeds
+import requests
+import responsecache
+
+PODCASTS = 10
+
+
+def visit(cache, server, podcast_id):
+    # As fetch_about does for a Top 100 podcast: look up the feed URL, then read the feed's channel
+    feed_url = cache.get('lookup', podcast_id,
+                         lambda: requests.get(server.url('/lookup/{}'.format(podcast_id))).json()['feedUrl'])
+
+    def read():
+        with feeds.fetch_feed(feed_url) as feed_req:
+            return feeds.read_channel(feed_req.raw)
+    return cache.get('channel', feed_url, read)
+
+
+def timed_visits(cache, server):
+    start = time.perf_counter()
+    for podcast_id in range(PODCASTS):
+        assert visit(cache, server, podcast_id)['title']
+    return (time.perf_counter() - start) / PODCASTS
+
+
+def run():
+    with temp_database():
+        cache = responsecache.ResponseCache()
+        server = FeedServer(latency=0.2)
+        for podcast_id in range(PODCASTS):
+            feed_path = '/feed/{}.xml'.format(podcast_id)
+            server.add(feed_path, make_feed(100, title="Podcast {}".format(podcast_id)))
+            server.add('/lookup/{}'.format(podcast_id), json.dumps({'feedUrl': server.url(feed_path)}).encode(),
+                       'application/json')
+        first = timed_visits(cache, server)
+        again = timed_visits(cache, server)
+        server.close()
+        # Every response is now stale, and can't be fetched again
+        cache.ttls = dict.fromkeys(responsecache.TTLS, 0)
+        offline = timed_visits(cache, server)
+
+    print("{:<32} {:>8.1f} ms".format("first visit", first * 1000))
+    print("{:<32} {:>8.1f} ms".format("repeat visit", again * 1000))
+    print("{:<32} {:>8.1f} ms".format("stale visit, server offline", offline * 1000))
+    print("{stale} stale hits, {hit} hits, {miss} misses".format(**cache.stats()))
+    print("hit rate {:.0%}".format(cache.hit_rate()))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,81 @@
+"""
+Report lookup latency on a 100,000 episode database with only the
+tables created, as before schema migrations, and with the indexes added
+by models.migrate_database.
+"""
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+import synthetic
+
+import peewee
+import models
+from models import PodcastDB, EpisodeDB
+
+LOOKUPS = {
+    # The title index added by the migrations
+    "episode by title": lambda podcast, episode: EpisodeDB.get(EpisodeDB.title == episode),
+    # build_episode_view and refresh_episode_list, first screen
+    "newest 50 episodes of a podcast": lambda podcast, episode: list(
+        EpisodeDB.select().where(EpisodeDB.podcast == podcast).order_by(EpisodeDB.pub_date.desc())
+        .limit(50).tuples()),
+    # build_episode_view, remove_podcast and the library context menu
+    "podcast by title": lambda podcast, episode: PodcastDB.get(PodcastDB.title == "Podcast {}".format(podcast)),
+    # subscribe_to_podcast
+    "podcast by url": lambda podcast, episode: PodcastDB.get(PodcastDB.url == "http://localhost/{}.xml".format(podcast)),
+}
+
+
+def fill(db, podcast_count, episodes_per_podcast):
+    first = date(2000, 1, 1)
+    with db.atomic():
+        for p in range(1, podcast_count + 1):
+            PodcastDB.create(id=p, title="Podcast {}".format(p), url="http://localhost/{}.xml".format(p),
+                             image="")
+            rows = [{'podcast': p, 'title': "Podcast {} episode {}".format(p, e),
+                     'pub_date': first + timedelta(days=e), 'url': "http://localhost/{}/{}.mp3".format(p, e),
+                     'guid': "{}-{}".format(p, e), 'image': "", 'bookmark': 0}
+                    for e in range(episodes_per_podcast)]
+            for batch in peewee.chunked(rows, 100):
+                EpisodeDB.insert_many(batch).execute()
+
+
+def time_lookups(samples, repeat=200):
+    results = {}
+    for name, lookup in LOOKUPS.items():
+        start = time.perf_counter()
+        for podcast, episode in samples[:repeat]:
+            lookup(podcast, episode)
+        results[name] = (time.perf_counter() - start) / repeat * 1000
+    return results
+
+
+def run(podcast_count=100, episodes_per_podcast=1000):
+    rng = random.Random(1)
+    samples = []
+    for i in range(200):
+        podcast = rng.randint(1, podcast_count)
+        samples.append((podcast, "Podcast {} episode {}".format(podcast, rng.randrange(episodes_per_podcast))))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = peewee.SqliteDatabase(os.path.join(tmp_dir, 'bench.db'))
+        with db.bind_ctx(models.MODELS):
+            # The tables and foreign key index created before migrations existed
+            models.MIGRATIONS[0]()
+            db.execute_sql('CREATE INDEX "episodedb_podcast_id" ON "episodedb" ("podcast_id")')
+            fill(db, podcast_count, episodes_per_podcast)
+            before = time_lookups(samples)
+            models.migrate_database()
+            after = time_lookups(samples)
+        db.close()
+
+    print("{} episodes".format(podcast_count * episodes_per_podcast))
+    print("{:<32} {:>12} {:>12}".format("lookup", "before ms", "after ms"))
+    for name in LOOKUPS:
+        print("{:<32} {:>12.3f} {:>12.3f}".format(name, before[name], after[name]))
+
+
+if __name__ == '__main__':
+    run()
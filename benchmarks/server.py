@@ -0,0 +1,127 @@
+"""
+A local threaded HTTP server standing in for podcast hosts.
+
+Register a body under a path with FeedServer.add and fetch it from
+FeedServer.url(path). Responses carry an ETag and Last-Modified header,
+conditional requests are answered with 304 Not Modified and Range
+requests with 206 Partial Content. Latency and bandwidth can be set to
+stand in for a slow or distant host.
+"""
+import hashlib
+import re
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        resource = self.server.resources.get(self.path)
+        if resource is None:
+            self.send_error(404)
+            return
+        self.server.hits[self.path] = self.server.hits.get(self.path, 0) + 1
+        body, content_type, etag, last_modified = resource
+
+        if self.server.validators:
+            # As in HTTP, If-Modified-Since is ignored when there is an If-None-Match
+            if_none_match = self.headers.get('If-None-Match')
+            if if_none_match == etag or (if_none_match is None and
+                                         self.headers.get('If-Modified-Since') == last_modified):
+                self.send_response(304)
+                self.end_headers()
+                return
+
+        start, end = 0, len(body)
+        byte_range = re.match(r'bytes=(\d+)-(\d*)$', self.headers.get('Range', ''))
+        if byte_range:
+            start = int(byte_range.group(1))
+            if byte_range.group(2):
+                end = min(int(byte_range.group(2)) + 1, len(body))
+            if start >= len(body):
+                self.send_response(416)
+                self.send_header('Content-Range', 'bytes */{}'.format(len(body)))
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header('Content-Range', 'bytes {}-{}/{}'.format(start, end - 1, len(body)))
+        else:
+            self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(end - start))
+        self.send_header('Accept-Ranges', 'bytes')
+        if self.server.validators:
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', last_modified)
+        self.end_headers()
+
+        # Drop the connection part way through once, if asked to
+        drop_after = self.server.drop_after.pop(self.path, None)
+        if drop_after is not None:
+            end = min(end, start + drop_after)
+            self.close_connection = True
+        view = memoryview(body)
+        sent_start = time.perf_counter()
+        for offset in range(start, end, CHUNK_SIZE):
+            self.wfile.write(view[offset:min(offset + CHUNK_SIZE, end)])
+            if self.server.bandwidth:
+                # Sleep off whatever this response is ahead of the bandwidth
+                ahead = (offset + CHUNK_SIZE - start) / self.server.bandwidth - (time.perf_counter() - sent_start)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FeedServer:
+    """
+    Serve registered resources on localhost until the server is closed.
+    Set validators to False to emulate a host that ignores conditional
+    requests and sends no ETag or Last-Modified. latency adds a delay
+    in seconds before every response, and bandwidth, if given, limits
+    each response to that many bytes a second.
+    """
+
+    def __init__(self, validators=True, latency=0, bandwidth=0):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.resources = {}
+        self.httpd.hits = {}
+        self.httpd.validators = validators
+        self.httpd.latency = latency
+        self.httpd.bandwidth = bandwidth
+        self.httpd.drop_after = {}
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def add(self, path, body, content_type='application/rss+xml'):
+        etag = '"{}"'.format(hashlib.sha1(body).hexdigest())
+        self.httpd.resources[path] = (body, content_type, etag, formatdate(usegmt=True))
+
+    def drop_once(self, path, after_bytes):
+        """Cut the next response for path off after after_bytes bytes."""
+        self.httpd.drop_after[path] = after_bytes
+
+    def url(self, path):
+        return 'http://127.0.0.1:{}{}'.format(self.httpd.server_address[1], path)
+
+    def hits(self, path):
+        return self.httpd.hits.get(path, 0)
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,121 @@
+"""
+Measure how long Kodkast takes to start, each in a fresh interpreter
+with its own home directory holding a library of 150 podcasts:
+
+- import time of the kodkast module, from python -X importtime, with
+  the modules that take longest to import;
+- time to first window, from launching the interpreter until the
+  library view has been painted.
+
+Exits with status 1 if the median of either is over its budget, so it
+can be run as a regression check. Run with QT_QPA_PLATFORM=offscreen
+on a machine without a display.
+"""
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Regression thresholds in milliseconds
+IMPORT_BUDGET_MS = 200
+WINDOW_BUDGET_MS = 600
+
+RUNS = 5
+PODCASTS = 150
+
+FIRST_WINDOW = """
+import sys, time
+sys.path.insert(0, {root!r})
+from PyQt5 import QtWidgets as qtw
+from PyQt5 import QtCore as qtc
+import kodkast
+
+class FirstPaint(qtc.QObject):
+    def eventFilter(self, watched, event):
+        if event.type() == qtc.QEvent.Paint:
+            print(time.time())
+            qtc.QTimer.singleShot(0, app.quit)
+            watched.removeEventFilter(self)
+        return False
+
+app = qtw.QApplication(sys.argv)
+mw = kodkast.MainWindow()
+first_paint = FirstPaint()
+mw.installEventFilter(first_paint)
+app.exec()
+"""
+
+
+def child_env(home):
+    env = dict(os.environ, HOME=home)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    # Measure with compiled bytecode, which the warm up start writes, as an installed copy has
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    return env
+
+
+def import_time(home):
+    """Return the cumulative import time of kodkast and its slowest imports, in ms."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import kodkast'], cwd=ROOT,
+                            env=child_env(home), capture_output=True, text=True, check=True)
+    # A module's imports are listed before it, so everything since the
+    # last top level module before kodkast was imported by kodkast
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        if name.rstrip() == ' kodkast':
+            return int(cumulative) / 1000, modules
+        if name.startswith('  '):
+            modules.append((int(cumulative) / 1000, int(own) / 1000, name.rstrip()))
+        else:
+            modules = []
+    raise RuntimeError("kodkast was not imported")
+
+
+def first_window(home):
+    """Return the ms from starting the interpreter to the main window's first paint."""
+    start = time.time()
+    result = subprocess.run([sys.executable, '-c', FIRST_WINDOW.format(root=ROOT)], cwd=ROOT,
+                            env=child_env(home), capture_output=True, text=True, check=True)
+    return (float(result.stdout.split()[-1]) - start) * 1000
+
+
+def add_podcasts(home):
+    database = sqlite3.connect(os.path.join(home, '.kodkast', 'kodkast.db'))
+    with database:
+        database.executemany(
+            "INSERT INTO podcastdb (title, url, image, rendered, art_key, etag, last_modified, content_hash, "
+            "next_refresh, refresh_failures) VALUES (?, ?, '', '', '', '', '', '', 0, 0)",
+            [("Podcast {}".format(i), "http://localhost/{}.xml".format(i)) for i in range(PODCASTS)])
+    database.close()
+
+
+def run():
+    with tempfile.TemporaryDirectory() as home:
+        # The first start creates the database, which isn't what is being measured
+        first_window(home)
+        add_podcasts(home)
+        imports = [import_time(home) for _ in range(RUNS)]
+        windows = [first_window(home) for _ in range(RUNS)]
+
+    import_ms = statistics.median(total for total, modules in imports)
+    window_ms = statistics.median(windows)
+    print("Slowest imports (cumulative ms, own ms):")
+    for cumulative, own, name in sorted(imports[-1][1], reverse=True)[:10]:
+        print("  {:>8.1f} {:>8.1f}  {}".format(cumulative, own, name))
+    print("{:<24} {:>8.1f} ms (budget {} ms)".format("import kodkast", import_ms, IMPORT_BUDGET_MS))
+    print("{:<24} {:>8.1f} ms (budget {} ms)".format("time to first window", window_ms, WINDOW_BUDGET_MS))
+    if import_ms > IMPORT_BUDGET_MS or window_ms > WINDOW_BUDGET_MS:
+        print("Startup is over budget")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    run()
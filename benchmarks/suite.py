@@ -0,0 +1,293 @@
+"""
+Run the benchmark scenarios against a temp database and a local server
+standing in for podcast hosts, and report the median of each
+measurement as JSON, so runs on different commits can be compared:
+
+    python benchmarks/suite.py --output before.json
+    git checkout my-branch
+    python benchmarks/suite.py --output after.json --compare before.json
+
+Scenarios:
+
+- subscribe: read a new podcast's channel, add it and merge its feed
+- refresh: refresh a podcast whose feed is unchanged, then one with a
+  new episode
+- refresh_all: refresh a library of podcasts on the worker pool
+- library_render: show the library on a cold and a warm artwork cache
+- episode_list_render: open the episode list of the subscribed podcast
+- download: download episodes on the download queue, and resume one
+  cut off half way
+
+--latency and --bandwidth apply to every response. Needs no display or
+network; Qt uses its offscreen platform unless QT_QPA_PLATFORM is set.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from library_render import make_image
+from server import FeedServer
+from synthetic import make_audio, make_feed, qt_application, temp_database
+
+import artwork
+import downloads
+import feeds
+import library
+import refresh
+import tasks
+from models import PodcastDB, EpisodeDB
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The feed generator's range, in episodes
+MIN_ITEMS = 10
+MAX_ITEMS = 50000
+
+
+def timed(function, *args):
+    """Return how long function took in ms, and what it returned."""
+    start = time.perf_counter()
+    result = function(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def subscribe(server, options):
+    server.add('/feed.xml', make_feed(options.items, base_url=server.url('/audio')))
+    url = server.url('/feed.xml')
+
+    def add():
+        with feeds.fetch_feed(url, library.HEADERS) as feed_req:
+            return library.subscribe(url, feeds.read_channel(feed_req.raw))
+    channel_ms, podcast = timed(add)
+    merge_ms, (inserted, updated, deleted) = timed(refresh.refresh_podcast, podcast, library.HEADERS)
+    assert len(inserted) == options.items
+    return {'channel_ms': channel_ms, 'first_refresh_ms': merge_ms}
+
+
+def refresh_feed(server, options):
+    subscribe(server, options)
+    podcast = PodcastDB.get()
+    unchanged_ms, result = timed(refresh.refresh_podcast, podcast, library.HEADERS)
+    assert result == ([], [], [])
+    # The next day's feed, with one more episode
+    server.add('/feed.xml', make_feed(options.items + 1, base_url=server.url('/audio'),
+                                      newest=datetime(2020, 1, 2, tzinfo=timezone.utc)))
+    changed_ms, (inserted, updated, deleted) = timed(refresh.refresh_podcast, PodcastDB.get(), library.HEADERS)
+    assert len(inserted) == 1 and not updated and not deleted
+    return {'unchanged_ms': unchanged_ms, 'new_episode_ms': changed_ms}
+
+
+def refresh_library(server, options):
+    for i in range(options.podcasts):
+        path = '/feed-{}.xml'.format(i)
+        server.add(path, make_feed(options.podcast_items, title="Podcast {}".format(i)))
+        PodcastDB.create(title="Podcast {}".format(i), url=server.url(path), image="")
+    # A single local host stands in for many, so lift the per-host limit
+    elapsed_ms, results = timed(lambda: refresh.refresh_all(headers=library.HEADERS,
+                                                            per_host=refresh.REFRESH_WORKERS))
+    assert not any(isinstance(result, Exception) for result in results.values())
+    return {'total_ms': elapsed_ms, 'per_podcast_ms': elapsed_ms / options.podcasts}
+
+
+def library_render(server, options):
+    from PyQt5 import QtCore as qtc
+    from PyQt5 import QtWidgets as qtw
+    from kodkast import QIconGrid
+
+    for i in range(options.podcasts):
+        server.add('/art/{}.jpg'.format(i), make_image(i, 600), 'image/jpeg')
+        PodcastDB.create(title="Podcast {}".format(i), url="http://localhost/{}.xml".format(i),
+                         image=server.url('/art/{}.jpg'.format(i)))
+
+    with tempfile.TemporaryDirectory() as art_dir:
+        cache = artwork.ArtworkCache(art_dir)
+        task_manager = tasks.TaskManager()
+
+        def fetch_icon(task, url):
+            # As MainWindow.fetch_icon does
+            key = cache.fetch(url)
+            PodcastDB.update(art_key=key).where(PodcastDB.image == url).execute()
+            return cache.path(key, 'library')
+
+        def render():
+            # As MainWindow.refresh_podcast_list does, then wait for the artwork in view
+            grid = QIconGrid(task_manager, fetch_icon)
+            grid.resize(355, 600)
+            start = time.perf_counter()
+            for podcast in PodcastDB.select():
+                icon_path = cache.cached_path(podcast.art_key, 'library') if podcast.art_key else None
+                grid.add_podcast(podcast.title, podcast.image, icon_path)
+            grid.grab()
+            first_paint = time.perf_counter() - start
+            qtw.QApplication.processEvents()
+            while task_manager.running():
+                qtw.QApplication.processEvents(qtc.QEventLoop.AllEvents, 50)
+            grid.grab()
+            return first_paint * 1000, (time.perf_counter() - start) * 1000
+
+        cold_paint_ms, cold_loaded_ms = render()
+        warm_paint_ms, warm_loaded_ms = render()
+    return {'cold_first_paint_ms': cold_paint_ms, 'cold_artwork_ms': cold_loaded_ms,
+            'warm_first_paint_ms': warm_paint_ms, 'warm_artwork_ms': warm_loaded_ms}
+
+
+def episode_list_render(server, options):
+    from PyQt5 import QtWidgets as qtw
+    import episodemodel
+
+    subscribe(server, options)
+    podcast = PodcastDB.get()
+
+    def render():
+        # As MainWindow.build_episode_view sets up the table
+        model = episodemodel.EpisodeTableModel(podcast)
+        table = qtw.QTableView()
+        table.setModel(model)
+        table.horizontalHeader().resizeSection(0, table.fontMetrics().horizontalAdvance("00-00-0000") + 12)
+        table.horizontalHeader().setStretchLastSection(True)
+        table.verticalHeader().setVisible(False)
+        table.resize(355, 600)
+        table.grab()
+        return model
+    render_ms, model = timed(render)
+    reload_ms, _ = timed(model.reload)
+    return {'first_paint_ms': render_ms, 'reload_ms': reload_ms}
+
+
+def download(server, options):
+    episodes = 3
+    size = options.episode_mb * 1024 * 1024
+    server.add('/feed.xml', make_feed(episodes, base_url=server.url('/audio')))
+    for i in range(1, episodes + 1):
+        server.add('/audio/episode-{}.mp3'.format(i), make_audio(size, i), 'audio/mpeg')
+    podcast = library.subscribe(server.url('/feed.xml'), {'title': "Synthetic Podcast", 'image': ""})
+    refresh.refresh_podcast(podcast, library.HEADERS)
+
+    with tempfile.TemporaryDirectory() as download_dir:
+        # Episodes are downloaded under ~/.kodkast by default
+        home_dir, downloads.db_dir = downloads.db_dir, download_dir
+        try:
+            failed = []
+            queue = downloads.DownloadQueue(workers=episodes, headers=library.HEADERS,
+                                            on_failed=lambda episode_id, error: failed.append(error))
+            for episode in EpisodeDB.select():
+                queue.add(episode)
+            start = time.perf_counter()
+            queue.start()
+            queue.drain()
+            queue_s = time.perf_counter() - start
+            assert not failed, failed[0]
+
+            resumed_file = os.path.join(download_dir, 'resumed.mp3')
+            url = server.url('/audio/episode-1.mp3')
+            server.drop_once('/audio/episode-1.mp3', size // 2)
+            try:
+                downloads.download_file(url, resumed_file)
+            except Exception:
+                pass
+            resume_ms, completed = timed(downloads.download_file, url, resumed_file)
+            assert completed and os.path.getsize(resumed_file) == len(make_audio(size, 1))
+        finally:
+            downloads.db_dir = home_dir
+    return {'queue_ms': queue_s * 1000, 'queue_mb_per_s': episodes * size / 1024 / 1024 / queue_s,
+            'resume_half_ms': resume_ms}
+
+
+SCENARIOS = {
+    'subscribe': subscribe,
+    'refresh': refresh_feed,
+    'refresh_all': refresh_library,
+    'library_render': library_render,
+    'episode_list_render': episode_list_render,
+    'download': download,
+}
+
+
+def run_scenario(scenario, options):
+    """Run a scenario options.repeat times, each on a fresh database and server, and return its medians."""
+    runs = []
+    for _ in range(options.repeat):
+        with FeedServer(latency=options.latency, bandwidth=options.bandwidth * 1024) as server, temp_database():
+            runs.append(SCENARIOS[scenario](server, options))
+    return {name: round(statistics.median(run[name] for run in runs), 3) for name in runs[0]}
+
+
+def commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(report, baseline=None):
+    for scenario, measurements in report['results'].items():
+        print(scenario)
+        for name, value in measurements.items():
+            line = "  {:<24} {:>12.3f}".format(name, value)
+            before = baseline and baseline['results'].get(scenario, {}).get(name)
+            if before:
+                line += " {:>+8.1%} from {:.3f}".format(value / before - 1, before)
+            print(line)
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(description="Run the benchmark scenarios and report the results as JSON.")
+    parser.add_argument('scenarios', nargs='*', metavar='scenario',
+                        help="scenarios to run, all of them if none are given: " + ", ".join(SCENARIOS))
+    parser.add_argument('--items', type=int, default=10000,
+                        help="episodes in the feed of a single podcast, {} to {}".format(MIN_ITEMS, MAX_ITEMS))
+    parser.add_argument('--podcasts', type=int, default=50, help="podcasts in the library")
+    parser.add_argument('--podcast-items', type=int, default=200, help="episodes in the feed of each podcast")
+    parser.add_argument('--episode-mb', type=int, default=20, help="size of each downloaded episode in MB")
+    parser.add_argument('--latency', type=float, default=0.05, help="seconds before every response")
+    parser.add_argument('--bandwidth', type=int, default=0, help="KB/s for each response, 0 for no limit")
+    parser.add_argument('--repeat', type=int, default=3, help="times to run each scenario")
+    parser.add_argument('--output', help="file to write the JSON report to, - for stdout")
+    parser.add_argument('--compare', metavar='REPORT', help="an earlier JSON report to compare the results to")
+    return parser
+
+
+def run(argv=None):
+    parser = make_parser()
+    options = parser.parse_args(argv)
+    unknown = set(options.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error("unknown scenario: {}".format(", ".join(sorted(unknown))))
+    if not MIN_ITEMS <= options.items <= MAX_ITEMS:
+        parser.error("--items must be from {} to {}".format(MIN_ITEMS, MAX_ITEMS))
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    qt_application()
+
+    report = {
+        'commit': commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'options': {name: value for name, value in vars(options).items() if name not in ('output', 'compare')},
+        'results': {},
+    }
+    for scenario in options.scenarios or SCENARIOS:
+        report['results'][scenario] = run_scenario(scenario, options)
+
+    baseline = None
+    if options.compare:
+        with open(options.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+    if options.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print_results(report, baseline)
+        if options.output:
+            with open(options.output, 'w') as output_file:
+                json.dump(report, output_file, indent=2)
+
+
+if __name__ == '__main__':
+    run()
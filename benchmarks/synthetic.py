@@ -0,0 +1,84 @@
+"""
+Synthetic data helpers shared by the benchmark scripts.
+"""
+import contextlib
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import peewee
+import models
+
+# The QApplication, kept here so Qt doesn't delete it while the benchmark runs
+_application = None
+
+
+def make_feed(item_count, title="Synthetic Podcast", base_url="http://localhost/audio", newest=None):
+    """
+    Build an RSS document with item_count episodes, newest first, one a
+    day up to newest. Episode n is the same in every feed published on
+    the same day, so a feed with one more item published a day later has
+    one new episode.
+    """
+    newest = newest or datetime(2020, 1, 1, tzinfo=timezone.utc)
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<rss version="2.0" xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd">\n'
+        '<channel>\n'
+        '<title>{}</title>\n'
+        '<description>A generated feed for benchmarking.</description>\n'
+        '<itunes:author>Kodkast</itunes:author>\n'
+        '<itunes:image href="{}/cover.jpg"/>\n'.format(escape(title), base_url)
+    ]
+    for i in range(item_count):
+        published = newest - timedelta(days=i)
+        parts.append(
+            '<item>'
+            '<title>Episode {0}</title>'
+            '<description>Show notes for episode {0}.</description>'
+            '<guid isPermaLink="false">synthetic-{0}</guid>'
+            '<pubDate>{1}</pubDate>'
+            '<itunes:duration>3600</itunes:duration>'
+            '<enclosure url="{2}/episode-{0}.mp3" length="1000000" type="audio/mpeg"/>'
+            '</item>\n'.format(item_count - i, published.strftime("%a, %d %b %Y %H:%M:%S %z"), base_url)
+        )
+    parts.append('</channel>\n</rss>\n')
+    return ''.join(parts).encode('utf-8')
+
+
+def make_audio(size, seed=0):
+    """
+    Return about size bytes shaped like a 128 kbps MP3: an ID3 tag, then
+    frames of random data, each starting with an MPEG audio frame header.
+    """
+    rng = random.Random(seed)
+    header = b'\xff\xfb\x90\x64'
+    frame_size = 417
+    frames = max(size // frame_size, 1)
+    return b'ID3\x04\x00\x00\x00\x00\x00\x00' + b''.join(
+        header + rng.randbytes(frame_size - len(header)) for _ in range(frames))
+
+
+@contextlib.contextmanager
+def temp_database():
+    """
+    Bind the models to a fresh SQLite file for the duration of the block.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = peewee.SqliteDatabase(os.path.join(tmp_dir, 'bench.db'))
+        with db.bind_ctx(models.MODELS):
+            models.migrate_database()
+            yield db
+        db.close()
+
+
+def qt_application():
+    """Create the QApplication the widget benchmarks need, if there isn't one yet."""
+    global _application
+    from PyQt5 import QtWidgets as qtw
+    _application = qtw.QApplication.instance() or qtw.QApplication(sys.argv[:1])
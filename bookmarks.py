@@ -0,0 +1,79 @@
+import threading
+import peewee
+from models import database, EpisodeDB
+
+
+class BookmarkJournal:
+    """
+    Keeps the latest playback position of each episode in memory and
+    writes them to EpisodeDB.bookmark from a background thread, at most
+    once every interval seconds. Repeated positions for the same episode
+    are coalesced into one write, and only the bookmark column is written.
+
+    Call flush() when a position must not be lost, such as on pause,
+    seek or changing episode. At most interval seconds of progress are
+    lost if the app crashes.
+    """
+
+    def __init__(self, interval=5):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.writing = {}
+        self.wake = threading.Event()
+        self.stopping = False
+        self.thread = None
+
+    def start(self):
+        self.stopping = False
+        self.thread = threading.Thread(target=self._run, name='bookmarks', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Write anything pending and stop the writer."""
+        self.stopping = True
+        self.wake.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def record(self, episode_id, position):
+        """Remember an episode's position in milliseconds, to be written later."""
+        with self.lock:
+            self.pending[episode_id] = position
+
+    def position(self, episode):
+        """Return an episode's bookmark, including a position not yet written."""
+        with self.lock:
+            if episode.id in self.pending:
+                return self.pending[episode.id]
+            return self.writing.get(episode.id, episode.bookmark)
+
+    def flush(self):
+        """Have the writer write pending positions now rather than at its next interval."""
+        self.wake.set()
+
+    def _run(self):
+        with database.connection_context():
+            while not self.stopping:
+                self.wake.wait(self.interval)
+                self.wake.clear()
+                self._write()
+            # stop() may have come during the last write
+            self._write()
+
+    def _write(self):
+        with self.lock:
+            self.writing, self.pending = self.pending, {}
+        if not self.writing:
+            return
+        try:
+            with database.atomic():
+                for episode_id, position in self.writing.items():
+                    EpisodeDB.update(bookmark=position).where(EpisodeDB.id == episode_id).execute()
+        except peewee.DatabaseError:
+            # Try again next time, keeping any newer positions
+            with self.lock:
+                self.pending = {**self.writing, **self.pending}
+        with self.lock:
+            self.writing = {}
@@ -0,0 +1,224 @@
+"""
+Refresh feeds and download episodes without the GUI, such as from cron
+on a server, using the same database as the app:
+
+    python kodkast.py sync
+    python kodkast.py download --latest 3 --json
+
+cli.py can also be run directly with the same arguments, which doesn't
+need PyQt to be installed.
+"""
+import argparse
+import json
+import signal
+import sys
+import threading
+import time
+import peewee
+import downloads
+import library
+import metrics
+import models
+import refresh
+import schedule
+import settings
+from models import PodcastDB, EpisodeDB, DownloadDB
+
+# Exit statuses
+EXIT_OK = 0
+# Some podcasts couldn't be refreshed or some episodes couldn't be downloaded
+EXIT_FAILED = 1
+# Bad arguments, as argparse exits with
+EXIT_USAGE = 2
+# The database couldn't be opened or updated
+EXIT_DATABASE = 3
+# Stopped by SIGINT or SIGTERM
+EXIT_INTERRUPTED = 130
+
+# Seconds between progress events for each download
+PROGRESS_INTERVAL = 1.0
+
+
+class Reporter:
+    """
+    Writes each event to stdout as a line of JSON when as_json is set,
+    or as a message otherwise. Events without a message, such as
+    download progress, are only written as JSON. Can be called from any
+    thread.
+    """
+
+    def __init__(self, as_json=False, stream=None):
+        self.as_json = as_json
+        self.stream = stream or sys.stdout
+        self.lock = threading.Lock()
+
+    def __call__(self, event, message=None, **fields):
+        if self.as_json:
+            line = json.dumps(dict(event=event, **fields), default=str)
+        elif message is not None:
+            line = message
+        else:
+            return
+        with self.lock:
+            print(line, file=self.stream, flush=True)
+
+
+def sync(podcasts, args, report, interrupted):
+    """Refresh the feeds of podcasts, or of every podcast if it is None."""
+    start = time.monotonic()
+
+    def progress(done, total, podcast, result):
+        if isinstance(result, Exception):
+            report('failed', "[{}/{}] Could not refresh {}: {}".format(done, total, podcast.title, result),
+                   done=done, total=total, podcast=podcast.title, error=str(result))
+        else:
+            inserted, updated, deleted = result
+            report('refreshed', "[{}/{}] Refreshed {}: {} new".format(done, total, podcast.title, len(inserted)),
+                   done=done, total=total, podcast=podcast.title,
+                   inserted=len(inserted), updated=len(updated), deleted=len(deleted))
+
+    results = refresh.refresh_all(podcasts, library.HEADERS, workers=args.workers, per_host=args.per_host,
+                                  progress=progress, cancelled=interrupted.is_set)
+    failed = sum(1 for result in results.values() if isinstance(result, Exception))
+    report('finished', "Refreshed {} podcasts, {} failed".format(len(results) - failed, failed),
+           command='sync', refreshed=len(results) - failed, failed=failed,
+           seconds=round(time.monotonic() - start, 2))
+    if interrupted.is_set():
+        return EXIT_INTERRUPTED
+    return EXIT_FAILED if failed else EXIT_OK
+
+
+def download(podcasts, args, report, interrupted):
+    """
+    Queue the episodes chosen by --unplayed or --latest, then download
+    everything queued, including episodes queued in the app.
+    """
+    start = time.monotonic()
+    downloaded = []
+    failed = []
+    last_progress = {}
+
+    def on_progress(episode_id, done, total):
+        now = time.monotonic()
+        if now - last_progress.get(episode_id, 0) >= PROGRESS_INTERVAL:
+            last_progress[episode_id] = now
+            report('progress', episode=episode_id, done=done, total=total)
+
+    def on_finished(episode_id):
+        downloaded.append(episode_id)
+        episode = EpisodeDB.get_by_id(episode_id)
+        report('downloaded', "Downloaded {}".format(episode.title), episode=episode_id, title=episode.title,
+               path=downloads.downloaded_path(episode))
+
+    def on_failed(episode_id, error):
+        failed.append(episode_id)
+        episode = EpisodeDB.get_by_id(episode_id)
+        report('failed', "Could not download {}: {}".format(episode.title, error), episode=episode_id,
+               title=episode.title, error=str(error))
+
+    queue = downloads.DownloadQueue(workers=args.workers, bytes_per_second=args.rate_limit * 1024,
+                                    headers=library.HEADERS, on_progress=on_progress,
+                                    on_finished=on_finished, on_failed=on_failed)
+    if args.unplayed or args.latest:
+        for podcast in podcasts:
+            for episode in downloads.missing_episodes(podcast, args.unplayed, args.latest):
+                queue.add(episode)
+    queue.start()
+    queued = DownloadDB.select().count()
+    report('started', "Downloading {} episodes".format(queued), command='download', queued=queued,
+           workers=args.workers)
+    completed = queue.drain(cancelled=interrupted.is_set)
+    report('finished', "Downloaded {} episodes, {} failed".format(len(downloaded), len(failed)),
+           command='download', downloaded=len(downloaded), failed=len(failed),
+           seconds=round(time.monotonic() - start, 2))
+    if not completed:
+        return EXIT_INTERRUPTED
+    return EXIT_FAILED if failed else EXIT_OK
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return number
+
+
+def non_negative_int(value):
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError("must be 0 or more")
+    return number
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(prog='kodkast', description="Refresh feeds and download episodes.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    sync_parser = commands.add_parser('sync', help="refresh the feeds of the podcasts in the library")
+    sync_parser.add_argument('--workers', type=positive_int, default=refresh.REFRESH_WORKERS,
+                             help="feeds downloaded at the same time")
+    sync_parser.add_argument('--per-host', type=positive_int, default=refresh.REFRESH_PER_HOST,
+                             help="feeds downloaded at the same time from one host")
+    sync_parser.add_argument('--due', action='store_true',
+                             help="only the feeds due to be refreshed, for running every few minutes")
+
+    download_parser = commands.add_parser('download', help="download the queued episodes")
+    download_parser.add_argument('--workers', type=positive_int, default=settings.value('download_workers'),
+                                 help="episodes downloaded at the same time")
+    download_parser.add_argument('--rate-limit', type=non_negative_int, default=settings.value('download_rate_limit'),
+                                 help="combined download speed limit in KB/s, 0 for no limit")
+    download_parser.add_argument('--unplayed', action='store_true',
+                                 help="first queue the episodes that haven't been started")
+    download_parser.add_argument('--latest', type=positive_int, metavar='N',
+                                 help="first queue the newest N episodes of each podcast")
+
+    for command_parser in (sync_parser, download_parser):
+        command_parser.add_argument('--podcast', action='append', metavar='TITLE',
+                                    help="only this podcast, can be given more than once")
+        command_parser.add_argument('--json', action='store_true',
+                                    help="write progress as one JSON object per line")
+    return parser
+
+
+def main(argv=None):
+    parser = make_parser()
+    args = parser.parse_args(argv)
+    if args.command == 'download' and args.podcast and not (args.unplayed or args.latest):
+        parser.error("--podcast needs --unplayed or --latest")
+
+    try:
+        library.open_library()
+    except peewee.DatabaseError as e:
+        print("Could not update the database: {}".format(e), file=sys.stderr)
+        return EXIT_DATABASE
+
+    try:
+        podcasts = None
+        if args.podcast:
+            podcasts, missing = library.find_podcasts(args.podcast)
+            if missing:
+                print("Not in the library: {}".format(", ".join(missing)), file=sys.stderr)
+                return EXIT_USAGE
+        elif args.command == 'download':
+            podcasts = list(PodcastDB.select())
+        if args.command == 'sync' and args.due:
+            due = schedule.due_podcasts()
+            if podcasts is not None:
+                chosen = {podcast.id for podcast in podcasts}
+                due = [podcast for podcast in due if podcast.id in chosen]
+            podcasts = due
+
+        # Finish the podcast or episode in hand and stop, rather than dying part way through a write
+        interrupted = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda signum, frame: interrupted.set())
+
+        command = sync if args.command == 'sync' else download
+        return command(podcasts, args, Reporter(args.json), interrupted)
+    finally:
+        metrics.write_counters()
+        models.close_database()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
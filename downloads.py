@@ -0,0 +1,454 @@
+import hashlib
+import os
+import re
+import shutil
+import threading
+import time
+import urllib.parse
+import peewee
+import metrics
+from models import database, db_dir, PodcastDB, EpisodeDB, DownloadDB, LocalFileDB
+
+# Bytes read from the network and written to disk at a time
+CHUNK_SIZE = 256 * 1024
+
+# Seconds to wait for a host to connect and to send each chunk
+DOWNLOAD_TIMEOUT = (10, 60)
+
+PART_SUFFIX = '.part'
+
+# Queue priorities, higher downloads first
+PRIORITY_NORMAL = 0
+PRIORITY_HIGH = 10
+
+
+def _content_range(header):
+    """
+    Parse a Content-Range header into (start, total). Either can be None.
+    """
+    match = re.match(r'bytes\s+(?:(\d+)-\d+|\*)/(\d+|\*)', header or '')
+    if not match:
+        return None, None
+    start = int(match.group(1)) if match.group(1) is not None else None
+    total = int(match.group(2)) if match.group(2) != '*' else None
+    return start, total
+
+
+def episode_path(episode):
+    """
+    Return where an episode is downloaded to. The file name starts with
+    the episode id, so episodes whose urls end in the same name, such as
+    audio.mp3, don't overwrite each other.
+    """
+    pod_db = PodcastDB.get_by_id(episode.podcast_id)
+    return os.path.join(db_dir, pod_db.title, _download_filename(episode.id, episode.url))
+
+
+def _download_filename(episode_id, url):
+    return '{}-{}'.format(episode_id, os.path.basename(urllib.parse.urlsplit(url).path) or 'episode')
+
+
+def file_checksum(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as infile:
+        for chunk in iter(lambda: infile.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def record_download(episode, path, checksum=""):
+    """Add a downloaded file to the download index."""
+    LocalFileDB.insert(episode=episode, path=path, size=os.path.getsize(path),
+                       checksum=checksum).on_conflict_replace().execute()
+
+
+def downloaded_path(episode):
+    """Return the downloaded file of an episode, or None."""
+    local_file = LocalFileDB.get_or_none(LocalFileDB.episode == episode)
+    return local_file.path if local_file else None
+
+
+def downloaded_ids(podcast):
+    """Return the ids of a podcast's downloaded episodes."""
+    query = LocalFileDB.select(LocalFileDB.episode).join(EpisodeDB).where(EpisodeDB.podcast == podcast)
+    return {episode_id for (episode_id,) in query.tuples()}
+
+
+def missing_episodes(podcast, unplayed=False, latest=None):
+    """
+    Return a podcast's episodes that haven't been downloaded, newest
+    first. unplayed leaves out episodes that have been started, and
+    latest only looks at that many of the newest episodes.
+    """
+    query = EpisodeDB.select().where(EpisodeDB.podcast == podcast).order_by(EpisodeDB.pub_date.desc())
+    if unplayed:
+        query = query.where(EpisodeDB.bookmark == 0)
+    if latest is not None:
+        query = query.limit(latest)
+    downloaded = downloaded_ids(podcast)
+    return [episode for episode in query if episode.id not in downloaded]
+
+
+def delete_download(episode):
+    """
+    Delete an episode's downloaded file, and its podcast's folder if that
+    leaves it empty. Returns False if the episode wasn't downloaded.
+    """
+    local_file = LocalFileDB.get_or_none(LocalFileDB.episode == episode)
+    if local_file is None:
+        return False
+    if os.path.isfile(local_file.path):
+        os.remove(local_file.path)
+    local_file.delete_instance()
+    pod_dir = os.path.dirname(local_file.path)
+    if os.path.isdir(pod_dir) and not os.listdir(pod_dir):
+        os.rmdir(pod_dir)
+    return True
+
+
+def forget_episodes(episode_ids):
+    """
+    Take episodes that are about to be deleted off the download queue
+    and out of the download index, so a new episode given the same id
+    doesn't inherit them. Returns the paths of their downloaded files,
+    for delete_files once the episodes are gone.
+    """
+    paths = []
+    for batch in peewee.chunked(episode_ids, 500):
+        query = LocalFileDB.select(LocalFileDB.path).where(LocalFileDB.episode.in_(batch))
+        paths.extend(path for (path,) in query.tuples())
+        LocalFileDB.delete().where(LocalFileDB.episode.in_(batch)).execute()
+        DownloadDB.delete().where(DownloadDB.episode.in_(batch)).execute()
+    return paths
+
+
+def delete_files(paths):
+    """Delete downloaded files, and their podcasts' folders if that leaves them empty."""
+    for path in paths:
+        if os.path.isfile(path):
+            os.remove(path)
+        pod_dir = os.path.dirname(path)
+        if os.path.isdir(pod_dir) and not os.listdir(pod_dir):
+            os.rmdir(pod_dir)
+
+
+def delete_podcast_downloads(podcast):
+    """Delete a podcast's download folder and its episodes from the download index."""
+    LocalFileDB.delete().where(
+        LocalFileDB.episode.in_(EpisodeDB.select(EpisodeDB.id).where(EpisodeDB.podcast == podcast))).execute()
+    pod_dir = os.path.join(db_dir, podcast.title)
+    if os.path.isdir(pod_dir):
+        shutil.rmtree(pod_dir)
+
+
+def reconcile_downloads():
+    """
+    Bring the download index in line with the download folders, reading
+    each podcast's folder once. Files that have gone are dropped from the
+    index, and episode files that aren't indexed are added, such as those
+    downloaded before the index existed and named after the end of their
+    url. A file whose name is shared by more than one of its podcast's
+    urls can't be told apart and is left out.
+    Returns the number of files added and dropped.
+    """
+    on_disk = {}
+    for podcast_id, title in PodcastDB.select(PodcastDB.id, PodcastDB.title).tuples():
+        pod_dir = os.path.join(db_dir, title)
+        if not os.path.isdir(pod_dir):
+            continue
+        with os.scandir(pod_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and not entry.name.endswith(PART_SUFFIX):
+                    on_disk[entry.path] = (podcast_id, entry.name, entry.stat().st_size)
+
+    indexed = {local_file.path: local_file for local_file in LocalFileDB.select()}
+    gone = [local_file.id for path, local_file in indexed.items() if path not in on_disk]
+    resized = [local_file for path, local_file in indexed.items()
+               if path in on_disk and local_file.size != on_disk[path][2]]
+
+    added = []
+    unindexed = {path: info for path, info in on_disk.items() if path not in indexed}
+    if unindexed:
+        known_ids = {local_file.episode_id for path, local_file in indexed.items() if path in on_disk}
+        by_filename = {}
+        podcast_ids = {podcast_id for podcast_id, name, size in unindexed.values()}
+        query = (EpisodeDB.select(EpisodeDB.id, EpisodeDB.podcast, EpisodeDB.url)
+                 .where(EpisodeDB.podcast.in_(list(podcast_ids))).tuples())
+        for episode_id, podcast_id, url in query:
+            for filename in (_download_filename(episode_id, url), url.split('/')[-1]):
+                by_filename.setdefault((podcast_id, filename), set()).add(episode_id)
+        for path, (podcast_id, name, size) in unindexed.items():
+            episode_ids = by_filename.get((podcast_id, name), ())
+            episode_id = next(iter(episode_ids)) if len(episode_ids) == 1 else None
+            if episode_id is not None and episode_id not in known_ids:
+                known_ids.add(episode_id)
+                added.append({'episode': episode_id, 'path': path, 'size': size, 'checksum': ""})
+
+    with database.atomic():
+        for batch in peewee.chunked(gone, 500):
+            LocalFileDB.delete().where(LocalFileDB.id.in_(batch)).execute()
+        for local_file in resized:
+            LocalFileDB.update(size=on_disk[local_file.path][2], checksum="").where(
+                LocalFileDB.id == local_file.id).execute()
+        for batch in peewee.chunked(added, 100):
+            LocalFileDB.insert_many(batch).execute()
+    return len(added), len(gone)
+
+
+class RateLimiter:
+    """
+    A token bucket shared by every download, capping their combined
+    speed at bytes_per_second. A rate of 0 means no limit.
+    """
+
+    def __init__(self, bytes_per_second=0):
+        self.lock = threading.Lock()
+        self.bytes_per_second = bytes_per_second
+        self.allowance = 0
+        self.last_check = time.monotonic()
+
+    def set_rate(self, bytes_per_second):
+        with self.lock:
+            self.bytes_per_second = bytes_per_second
+            self.allowance = 0
+
+    def consume(self, size):
+        """Block until size more bytes may be transferred."""
+        with self.lock:
+            if not self.bytes_per_second:
+                return
+            now = time.monotonic()
+            # Allow at most one second of burst
+            self.allowance = min(self.allowance + (now - self.last_check) * self.bytes_per_second,
+                                 self.bytes_per_second)
+            self.last_check = now
+            self.allowance -= size
+            wait = -self.allowance / self.bytes_per_second if self.allowance < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+def download_file(url, local_file, headers=None, session=None, progress=None, cancelled=None,
+                  timeout=DOWNLOAD_TIMEOUT, limiter=None):
+    """
+    Stream url to local_file in CHUNK_SIZE pieces, so memory use does
+    not depend on the size of the file.
+
+    Data is written to local_file + '.part'. If that file exists from an
+    interrupted download, only the missing bytes are requested with an
+    HTTP Range request. The part file is renamed to local_file once it
+    is complete, so local_file is never left half written.
+
+    progress, if given, is called with (bytes_done, bytes_total) after
+    each chunk; bytes_total is 0 when the server doesn't send a length.
+    cancelled, if given, is polled between chunks. A cancelled download
+    keeps its part file so it can be resumed, and returns False.
+    limiter, if given, is a RateLimiter shared with other downloads.
+    Returns True when local_file is complete.
+    """
+    # Imported on first use, as downloads is loaded at start up
+    import certifi
+    import requests
+
+    part_file = local_file + PART_SUFFIX
+    offset = os.path.getsize(part_file) if os.path.isfile(part_file) else 0
+    request_headers = dict(headers or {})
+    # Byte ranges only line up with the file on disk if the body isn't compressed
+    request_headers['Accept-Encoding'] = 'identity'
+    if offset:
+        request_headers['Range'] = 'bytes={}-'.format(offset)
+
+    with (session or requests).get(url, stream=True, verify=certifi.where(), headers=request_headers,
+                                   timeout=timeout) as mp3_req:
+        if mp3_req.status_code == 416:
+            # Nothing left to fetch if the part file already holds the whole episode
+            start, total = _content_range(mp3_req.headers.get('Content-Range'))
+            if total is not None and total == offset:
+                os.replace(part_file, local_file)
+                return True
+            os.remove(part_file)
+            return download_file(url, local_file, headers, session, progress, cancelled, timeout, limiter)
+        mp3_req.raise_for_status()
+
+        if mp3_req.status_code == 206:
+            start, total = _content_range(mp3_req.headers.get('Content-Range'))
+            if start != offset:
+                raise IOError("Server resumed {} at byte {} instead of {}".format(url, start, offset))
+            mode = 'ab'
+        else:
+            # The server ignored the Range header, so start over
+            offset = 0
+            total = int(mp3_req.headers.get('Content-Length', 0)) or None
+            mode = 'wb'
+
+        done = offset
+        with open(part_file, mode) as outfile:
+            for chunk in mp3_req.iter_content(CHUNK_SIZE):
+                if limiter:
+                    limiter.consume(len(chunk))
+                outfile.write(chunk)
+                done += len(chunk)
+                if progress:
+                    progress(done, total or 0)
+                if cancelled and cancelled():
+                    return False
+            outfile.flush()
+            os.fsync(outfile.fileno())
+
+    if total is not None and done != total:
+        raise IOError("Downloaded {} of {} bytes from {}".format(done, total, url))
+    os.replace(part_file, local_file)
+    return True
+
+
+class DownloadQueue:
+    """
+    Downloads the episodes queued in DownloadDB on a pool of worker
+    threads. The queue lives in the database, so episodes that were
+    queued or part way through when the app closed are picked up again
+    on the next start.
+
+    Episodes are downloaded in order of priority, then episodes that
+    have been started before episodes that haven't, then oldest first,
+    so the next episode to listen to arrives first.
+
+    on_progress(episode_id, done, total), on_finished(episode_id) and
+    on_failed(episode_id, error) are called from the worker threads.
+    """
+
+    def __init__(self, workers=3, bytes_per_second=0, headers=None,
+                 on_progress=None, on_finished=None, on_failed=None):
+        self.workers = workers
+        self.limiter = RateLimiter(bytes_per_second)
+        self.headers = headers
+        self.on_progress = on_progress
+        self.on_finished = on_finished
+        self.on_failed = on_failed
+        self.lock = threading.Lock()
+        self.wake = threading.Condition(self.lock)
+        self.stopping = False
+        self.draining = False
+        self.active = {}
+        self.threads = []
+
+    def start(self):
+        # Anything left downloading or failed by the last run is tried again
+        DownloadDB.update(status='queued', error="").execute()
+        self.stopping = False
+        self.draining = False
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name='download-{}'.format(i), daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self):
+        """Stop the workers. Running downloads keep their part files."""
+        with self.lock:
+            self.stopping = True
+            self.wake.notify_all()
+        for thread in self.threads:
+            # Workers check for stopping between chunks, but a stalled read can take a while
+            thread.join(5)
+        self.threads = []
+
+    def drain(self, cancelled=None):
+        """
+        Download everything queued, then stop the workers instead of
+        waiting for more episodes to be queued, as when downloading
+        without the app. cancelled, if given, is polled while waiting and
+        stops the workers when it returns True. Returns False if cancelled.
+        """
+        with self.lock:
+            self.draining = True
+            self.wake.notify_all()
+        while any(thread.is_alive() for thread in self.threads):
+            if cancelled and cancelled():
+                self.stop()
+                return False
+            time.sleep(0.2)
+        self.threads = []
+        return True
+
+    def add(self, episode, priority=PRIORITY_NORMAL):
+        """
+        Queue an episode, or raise its priority if it is already queued.
+        An episode whose last attempt failed is queued to be tried again.
+        """
+        failed = DownloadDB.status == 'failed'
+        DownloadDB.insert(episode=episode, priority=priority).on_conflict(
+            conflict_target=[DownloadDB.episode],
+            update={DownloadDB.priority: peewee.fn.MAX(DownloadDB.priority, priority),
+                    DownloadDB.status: peewee.Case(None, [(failed, 'queued')], DownloadDB.status),
+                    DownloadDB.error: peewee.Case(None, [(failed, "")], DownloadDB.error)},
+        ).execute()
+        with self.lock:
+            self.wake.notify()
+
+    def remove(self, episode):
+        """Take an episode off the queue, stopping it if it is downloading."""
+        DownloadDB.delete().where(DownloadDB.episode == episode).execute()
+        with self.lock:
+            if episode.id in self.active:
+                self.active[episode.id].set()
+
+    def is_queued(self, episode):
+        """Return whether an episode is waiting to download or downloading, rather than failed."""
+        return DownloadDB.select().where((DownloadDB.episode == episode) &
+                                         (DownloadDB.status != 'failed')).exists()
+
+    def _claim_next(self):
+        """Mark the next queued download as downloading and return it."""
+        job = (DownloadDB.select(DownloadDB, EpisodeDB)
+               .join(EpisodeDB)
+               .where(DownloadDB.status == 'queued')
+               .order_by(DownloadDB.priority.desc(), (EpisodeDB.bookmark > 0).desc(),
+                         EpisodeDB.pub_date, DownloadDB.id)
+               .first())
+        if job:
+            job.status = 'downloading'
+            job.save(only=[DownloadDB.status])
+            self.active[job.episode.id] = threading.Event()
+        return job
+
+    def _work(self):
+        with database.connection_context():
+            while True:
+                with self.lock:
+                    job = None
+                    while not self.stopping:
+                        job = self._claim_next()
+                        if job or self.draining:
+                            break
+                        self.wake.wait()
+                    if self.stopping or job is None:
+                        return
+                    removed = self.active[job.episode.id]
+                self._download(job, removed)
+                with self.lock:
+                    del self.active[job.episode.id]
+
+    def _download(self, job, removed):
+        episode = job.episode
+        try:
+            local_file = episode_path(episode)
+            os.makedirs(os.path.dirname(local_file), exist_ok=True)
+            with metrics.span('download') as fields:
+                completed = download_file(
+                    episode.url, local_file, self.headers, limiter=self.limiter,
+                    progress=lambda done, total: self.on_progress and self.on_progress(episode.id, done, total),
+                    cancelled=lambda: self.stopping or removed.is_set())
+                fields['completed'] = completed
+                if completed:
+                    fields['bytes'] = os.path.getsize(local_file)
+            if completed:
+                record_download(episode, local_file, file_checksum(local_file))
+        except Exception as e:
+            DownloadDB.update(status='failed', error=str(e)).where(DownloadDB.id == job.id).execute()
+            metrics.count('download.failed')
+            if self.on_failed:
+                self.on_failed(episode.id, e)
+            return
+        if completed:
+            DownloadDB.delete().where(DownloadDB.id == job.id).execute()
+            if self.on_finished:
+                self.on_finished(episode.id)
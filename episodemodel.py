@@ -0,0 +1,200 @@
+from datetime import date, timedelta
+from PyQt5 import QtCore as qtc
+from PyQt5 import QtGui as qtg
+import downloads
+import search
+from models import EpisodeDB
+
+
+class EpisodeTableModel(qtc.QAbstractTableModel):
+    """
+    The episodes of one podcast, newest first, as Date and Title columns.
+
+    Only the number of episodes is read up front. Rows are read from the
+    database a page at a time when the view first asks for them, which
+    is only for the rows on screen. Downloaded episodes, shown in green,
+    are read from the download index in one query.
+    """
+    COLUMNS = ['Date', 'Title']
+    EPISODE_ID_ROLE = qtc.Qt.UserRole + 1
+    PAGE_SIZE = 200
+
+    def __init__(self, podcast, parent=None):
+        super().__init__(parent)
+        self.podcast = podcast
+        self.count = 0
+        self.pages = {}
+        self.rows = {}
+        self.downloaded = set()
+        self.today = date.today()
+        self.reload()
+
+    def reload(self):
+        """Read the episode count and downloaded episodes again, dropping every page read."""
+        self.beginResetModel()
+        self.count = EpisodeDB.select().where(EpisodeDB.podcast == self.podcast).count()
+        self.pages = {}
+        self.rows = {}
+        self.downloaded = downloads.downloaded_ids(self.podcast)
+        self.today = date.today()
+        self.endResetModel()
+
+    def insert_episodes(self, episodes):
+        """
+        Show newly stored episodes. New episodes are normally the newest,
+        and are inserted at the top so the selection is kept; otherwise
+        the whole list is read again.
+        """
+        if not episodes:
+            return
+        if self.count and min(episode['pub_date'] for episode in episodes) >= self.pub_date(0):
+            self.beginInsertRows(qtc.QModelIndex(), 0, len(episodes) - 1)
+            self.count += len(episodes)
+            self.pages = {}
+            self.rows = {}
+            self.endInsertRows()
+        else:
+            self.reload()
+
+    def _row(self, row):
+        page = row // self.PAGE_SIZE
+        if page not in self.pages:
+            query = (EpisodeDB.select(EpisodeDB.id, EpisodeDB.pub_date, EpisodeDB.title)
+                     .where(EpisodeDB.podcast == self.podcast)
+                     .order_by(EpisodeDB.pub_date.desc(), EpisodeDB.id.desc())
+                     .offset(page * self.PAGE_SIZE)
+                     .limit(self.PAGE_SIZE)
+                     .tuples())
+            self.pages[page] = list(query)
+            for offset, episode in enumerate(self.pages[page]):
+                self.rows[episode[0]] = page * self.PAGE_SIZE + offset
+        rows = self.pages[page]
+        offset = row - page * self.PAGE_SIZE
+        # Episodes removed since the count was read leave the last page short
+        return rows[offset] if offset < len(rows) else None
+
+    def episode_id(self, row):
+        episode = self._row(row)
+        return episode[0] if episode else None
+
+    def pub_date(self, row):
+        episode = self._row(row)
+        return episode[1] if episode else None
+
+    def set_downloaded(self, episode, downloaded):
+        """Colour an episode's row for whether its download is on disk."""
+        if downloaded:
+            self.downloaded.add(episode.id)
+        else:
+            self.downloaded.discard(episode.id)
+        if episode.id in self.rows:
+            row = self.rows[episode.id]
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.COLUMNS) - 1),
+                                  [qtc.Qt.ForegroundRole])
+
+    def rowCount(self, parent=qtc.QModelIndex()):
+        return 0 if parent.isValid() else self.count
+
+    def columnCount(self, parent=qtc.QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=qtc.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        episode = self._row(index.row())
+        if episode is None:
+            return None
+        episode_id, pub_date, title = episode
+        if role == qtc.Qt.DisplayRole:
+            if index.column() == 1:
+                return title
+            if pub_date == self.today:
+                return "Today"
+            if pub_date == self.today - timedelta(days=1):
+                return "Yesterday"
+            return pub_date.strftime("%m-%d-%Y")
+        if role == qtc.Qt.ToolTipRole and index.column() == 1:
+            return title
+        if role == qtc.Qt.ForegroundRole and episode_id in self.downloaded:
+            return qtg.QColor("green")
+        if role == self.EPISODE_ID_ROLE:
+            return episode_id
+        return None
+
+    def headerData(self, section, orientation, role=qtc.Qt.DisplayRole):
+        if orientation == qtc.Qt.Horizontal:
+            if role == qtc.Qt.DisplayRole:
+                return self.COLUMNS[section]
+            if role == qtc.Qt.TextAlignmentRole:
+                return qtc.Qt.AlignLeft
+        return None
+
+
+class SearchResultsModel(qtc.QAbstractTableModel):
+    """
+    The episodes matching a search across all podcasts, best match
+    first, as Title and Podcast columns. The first page of results is
+    read when the search changes and later pages as the view scrolls
+    down to them.
+    """
+    COLUMNS = ['Title', 'Podcast']
+    EPISODE_ID_ROLE = EpisodeTableModel.EPISODE_ID_ROLE
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.text = ""
+        self.results = []
+        self.more = False
+
+    def search(self, text):
+        """Show the results for a new search, reading the first page."""
+        self.beginResetModel()
+        self.text = text
+        self.results = search.search_episodes(text)
+        self.more = len(self.results) == search.PAGE_SIZE
+        self.endResetModel()
+
+    def canFetchMore(self, parent=qtc.QModelIndex()):
+        return not parent.isValid() and self.more
+
+    def fetchMore(self, parent=qtc.QModelIndex()):
+        if parent.isValid():
+            return
+        page = search.search_episodes(self.text, len(self.results))
+        self.more = len(page) == search.PAGE_SIZE
+        if page:
+            self.beginInsertRows(qtc.QModelIndex(), len(self.results), len(self.results) + len(page) - 1)
+            self.results.extend(page)
+            self.endInsertRows()
+
+    def episode_id(self, row):
+        return self.results[row][0]
+
+    def rowCount(self, parent=qtc.QModelIndex()):
+        return 0 if parent.isValid() else len(self.results)
+
+    def columnCount(self, parent=qtc.QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=qtc.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        episode_id, title, podcast_title, pub_date, snippet = self.results[index.row()]
+        if role == qtc.Qt.DisplayRole:
+            return title if index.column() == 0 else podcast_title
+        if role == qtc.Qt.ToolTipRole:
+            lines = [title, "{}, {}".format(podcast_title, pub_date.strftime("%m-%d-%Y"))]
+            if snippet:
+                lines.append(snippet)
+            return "\n".join(lines)
+        if role == self.EPISODE_ID_ROLE:
+            return episode_id
+        return None
+
+    def headerData(self, section, orientation, role=qtc.Qt.DisplayRole):
+        if orientation == qtc.Qt.Horizontal:
+            if role == qtc.Qt.DisplayRole:
+                return self.COLUMNS[section]
+            if role == qtc.Qt.TextAlignmentRole:
+                return qtc.Qt.AlignLeft
+        return None
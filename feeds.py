@@ -0,0 +1,319 @@
+import email.utils
+import hashlib
+import html
+import re
+import tempfile
+import threading
+import certifi
+import peewee
+import requests
+from dateutil import parser
+from lxml import etree
+import downloads
+import metrics
+import search
+from models import database, PodcastDB, EpisodeDB, QueueDB
+
+ITUNES_NS = '{http://www.itunes.com/dtds/podcast-1.0.dtd}'
+
+# Seconds to wait for a feed host to connect and to send each chunk
+FEED_TIMEOUT = (10, 60)
+
+# Feeds larger than this are spooled to disk while they are hashed
+SPOOL_SIZE = 4 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+# Rows per INSERT statement, kept well under SQLite's bound variable limit
+INSERT_BATCH_SIZE = 100
+
+_merge_lock = threading.Lock()
+
+_TAG = re.compile(r'<[^>]*>')
+_SPACE = re.compile(r'\s+')
+
+
+def fetch_feed(url, headers=None, session=None, timeout=FEED_TIMEOUT):
+    """
+    Start downloading a feed and return the streaming response. Its raw
+    body can be handed straight to iter_episodes or read_channel.
+    """
+    feed_req = (session or requests).get(url, stream=True, verify=certifi.where(), headers=headers,
+                                         timeout=timeout)
+    feed_req.raw.decode_content = True
+    return feed_req
+
+
+def fetch_feed_if_changed(podcast, headers=None, session=None, timeout=FEED_TIMEOUT):
+    """
+    Download a podcast's feed unless it is unchanged since the last
+    refresh, sending the stored ETag and Last-Modified validators.
+
+    Returns a tuple of (body, cache). body is a file object holding the
+    feed, or None when the server answered 304 or the content hash
+    matches the stored one. cache holds the validators to store once
+    the feed has been merged.
+    """
+    request_headers = dict(headers or {})
+    if podcast.etag:
+        request_headers['If-None-Match'] = podcast.etag
+    if podcast.last_modified:
+        request_headers['If-Modified-Since'] = podcast.last_modified
+
+    with metrics.span('feed.fetch') as fields, fetch_feed(podcast.url, request_headers, session, timeout) as feed_req:
+        fields['status'] = feed_req.status_code
+        if feed_req.status_code == 304:
+            metrics.count('feed.not_modified')
+            return None, {}
+        feed_req.raise_for_status()
+        # Spool the body while hashing it, so an unchanged feed is never parsed
+        body = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+        digest = hashlib.sha256()
+        for chunk in feed_req.iter_content(CHUNK_SIZE):
+            digest.update(chunk)
+            body.write(chunk)
+        fields['bytes'] = body.tell()
+        cache = {
+            'etag': feed_req.headers.get('ETag', ''),
+            'last_modified': feed_req.headers.get('Last-Modified', ''),
+            'content_hash': digest.hexdigest(),
+        }
+
+    if cache['content_hash'] == podcast.content_hash:
+        metrics.count('feed.unchanged')
+        body.close()
+        return None, cache
+    body.seek(0)
+    return body, cache
+
+
+def apply_feed(podcast, body, cache):
+    """
+    Merge a feed body returned by fetch_feed_if_changed and store its
+    cache validators. The validators are only stored if the merge
+    succeeds, so a failed merge is retried on the next refresh.
+    """
+    if body is None:
+        result = ([], [], [])
+    else:
+        with body:
+            result = merge_episodes(podcast, iter_episodes(body, podcast.image))
+    if cache:
+        for name, value in cache.items():
+            setattr(podcast, name, value)
+        podcast.save(only=[PodcastDB.etag, PodcastDB.last_modified, PodcastDB.content_hash])
+    return result
+
+
+def refresh_podcast(podcast, headers=None):
+    """
+    Conditionally download a podcast's feed and merge it. Returns the
+    same tuple as merge_episodes, which is empty when nothing changed.
+    """
+    body, cache = fetch_feed_if_changed(podcast, headers)
+    return apply_feed(podcast, body, cache)
+
+
+def _walk_feed(source):
+    """
+    Incrementally parse an RSS document, yielding each finished <item>
+    and every other direct child of <channel>. Elements are cleared once
+    the caller has looked at them, so memory stays flat for any feed size.
+    """
+    try:
+        for event, elem in etree.iterparse(source, events=('end',), recover=True):
+            parent = elem.getparent()
+            if parent is None or parent.tag != 'channel':
+                continue
+            yield elem
+            elem.clear(keep_tail=True)
+            while elem.getprevious() is not None:
+                del parent[0]
+    except etree.XMLSyntaxError:
+        return
+
+
+def _image_url(elem):
+    if elem.tag == ITUNES_NS + 'image':
+        return elem.get('href')
+    return elem.findtext('url')
+
+
+def _parse_date(text):
+    """
+    Parse a pubDate, trying the RFC 822 format feeds are supposed to use
+    before falling back to the much slower dateutil parser.
+    """
+    if not text:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(text).date()
+    except (TypeError, ValueError):
+        pass
+    try:
+        return parser.parse(text).date()
+    except (ValueError, OverflowError):
+        return None
+
+
+def _plain_text(text):
+    """Strip the HTML that show notes are usually written in, leaving the words."""
+    if not text:
+        return ""
+    return _SPACE.sub(' ', html.unescape(_TAG.sub(' ', text))).strip()
+
+
+def read_channel(source):
+    """
+    Read the podcast title, image, description and author from a feed,
+    stopping at the first <item>.
+    """
+    channel = {'title': None, 'image': None, 'description': None, 'author': None}
+    for elem in _walk_feed(source):
+        if elem.tag == 'item':
+            break
+        elif elem.tag == 'title':
+            channel['title'] = elem.text
+        elif elem.tag in ('image', ITUNES_NS + 'image') and not channel['image']:
+            channel['image'] = _image_url(elem)
+        elif elem.tag == 'description':
+            channel['description'] = elem.text
+        elif elem.tag in ('author', ITUNES_NS + 'author') and not channel['author']:
+            channel['author'] = elem.text
+    return channel
+
+
+def iter_episodes(source, default_image=None, limit=None):
+    """
+    Yield an episode dict for each <item> in a feed, with the keys title,
+    url, pub_date, image, guid, duration and description, the show notes
+    as plain text. Items without a title, enclosure or valid pubDate are
+    skipped. Stops after limit episodes if given.
+    """
+    channel_image = None
+    count = 0
+    for elem in _walk_feed(source):
+        if elem.tag in ('image', ITUNES_NS + 'image') and not channel_image:
+            channel_image = _image_url(elem)
+            continue
+        elif elem.tag != 'item':
+            continue
+
+        title = elem.findtext('title')
+        enclosure = elem.find('enclosure')
+        pub_date = _parse_date(elem.findtext('pubDate'))
+        if pub_date is None:
+            continue
+        if title is None or enclosure is None or not enclosure.get('url'):
+            continue
+        item_image = elem.find(ITUNES_NS + 'image')
+        yield {
+            'title': title,
+            'url': enclosure.get('url'),
+            'pub_date': pub_date,
+            'image': (item_image is not None and item_image.get('href')) or channel_image or default_image,
+            'guid': elem.findtext('guid'),
+            'duration': elem.findtext(ITUNES_NS + 'duration'),
+            'description': _plain_text(elem.findtext('description') or elem.findtext(ITUNES_NS + 'summary')),
+        }
+        count += 1
+        if limit is not None and count >= limit:
+            break
+
+
+def merge_episodes(podcast, items):
+    """
+    Merge parsed feed items into the stored episodes of a podcast.
+
+    The stored episodes are read once and indexed by guid, by (title,
+    url) and by title, so the feed is reconciled in a single pass. An
+    item is matched to a stored episode by guid, falling back to its
+    title and url for episodes stored before guids were recorded. A
+    matched episode keeps its row, and so its bookmark, even if its
+    title or url changed. An item whose title is already stored under
+    another URL replaces the old row. All changes, and the matching
+    changes to the search index, are applied in one transaction, and only
+    one merge runs at a time so concurrent refreshes can't insert the
+    same episode twice.
+
+    Returns a tuple of (inserted, updated, deleted): the new episode
+    dicts, the changed EpisodeDB rows and the ids of removed rows.
+    """
+    with _merge_lock:
+        with metrics.span('feed.parse') as fields:
+            items = list(items)
+            fields['episodes'] = len(items)
+        with metrics.span('feed.merge') as fields:
+            inserted, updated, deleted = _merge_episodes(podcast, items)
+            fields.update(inserted=len(inserted), updated=len(updated), deleted=len(deleted))
+        return inserted, updated, deleted
+
+
+def _merge_episodes(podcast, items):
+    by_guid = {}
+    by_key = {}
+    by_title = {}
+    for episode in EpisodeDB.select().where(EpisodeDB.podcast == podcast):
+        by_guid[episode.guid] = episode
+        by_key[(episode.title, episode.url)] = episode
+        by_title.setdefault(episode.title, []).append(episode)
+
+    feed_keys = {(item['title'], item['url']) for item in items}
+    inserts = []
+    updates = []
+    deletes = set()
+    seen = set()
+    matched = set()
+    for item in items:
+        guid = item['guid'] or item['url']
+        if guid in seen:
+            continue
+        seen.add(guid)
+        episode = by_guid.get(guid) or by_key.get((item['title'], item['url']))
+        if episode is not None and episode.id in matched:
+            episode = None
+        for old_episode in by_title.get(item['title'], ()):
+            if old_episode is not episode and (old_episode.title, old_episode.url) not in feed_keys:
+                deletes.add(old_episode.id)
+        if episode is None:
+            inserts.append({
+                'podcast': podcast.id,
+                'title': item['title'],
+                'url': item['url'],
+                'pub_date': item['pub_date'],
+                'image': item['image'],
+                'bookmark': 0,
+                'guid': guid,
+                'description': item['description'],
+            })
+            continue
+        matched.add(episode.id)
+        deletes.discard(episode.id)
+        changes = {'title': item['title'], 'url': item['url'], 'pub_date': item['pub_date'],
+                   'image': item['image'], 'guid': guid, 'description': item['description']}
+        if any(getattr(episode, name) != value for name, value in changes.items()):
+            for name, value in changes.items():
+                setattr(episode, name, value)
+            updates.append(episode)
+
+    updated_ids = [episode.id for episode in updates]
+    with database.atomic():
+        search.unindex_episodes(list(deletes) + updated_ids)
+        # Foreign keys aren't enforced, so the rows that refer to deleted
+        # episodes go with them here; SQLite can reuse a deleted episode's id
+        deleted_files = downloads.forget_episodes(list(deletes))
+        for batch in peewee.chunked(list(deletes), 500):
+            QueueDB.delete().where(QueueDB.episode.in_(batch)).execute()
+            EpisodeDB.delete().where(EpisodeDB.id.in_(batch)).execute()
+        for episode in updates:
+            episode.save(only=[EpisodeDB.title, EpisodeDB.url, EpisodeDB.pub_date, EpisodeDB.image,
+                               EpisodeDB.guid, EpisodeDB.description])
+        for batch in peewee.chunked(updated_ids, 500):
+            search.index_episodes(EpisodeDB.id.in_(batch))
+        for batch in peewee.chunked(inserts, INSERT_BATCH_SIZE):
+            EpisodeDB.insert_many(batch).execute()
+            # The new rows' ids aren't returned, so they are found by their guids
+            search.index_episodes((EpisodeDB.podcast == podcast) &
+                                  EpisodeDB.guid.in_([episode['guid'] for episode in batch]))
+    downloads.delete_files(deleted_files)
+
+    return inserts, updates, list(deletes)
@@ -0,0 +1,38 @@
+import models
+import settings
+from models import PodcastDB
+
+# Sent with every request, as some podcast hosts turn away clients they don't recognize
+HEADERS = {'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.11 (KHTML, like Gecko) Chrome/23.0.1271.64 Safari/537.11'}
+
+
+def open_library():
+    """
+    Connect the calling thread to the database and bring its tables up
+    to date. Raises peewee.DatabaseError if a migration fails, leaving
+    the database as it was.
+    """
+    models.open_database(settings.value('database_cache_size'), settings.value('database_mmap_size'))
+    models.migrate_database()
+
+
+def subscribe(url, channel):
+    """
+    Add the podcast whose feed is at url, with the channel details read
+    from it. Returns the new PodcastDB row, or None if a podcast with
+    the same title or url is already in the library.
+    """
+    query = PodcastDB.select().where((PodcastDB.title == channel['title']) | (PodcastDB.url == url))
+    if query.exists():
+        return None
+    return PodcastDB.create(title=channel['title'], url=url, image=channel['image'])
+
+
+def find_podcasts(titles):
+    """
+    Return the podcasts with the given titles, and the titles that
+    aren't in the library.
+    """
+    podcasts = list(PodcastDB.select().where(PodcastDB.title.in_(titles)))
+    found = {podcast.title for podcast in podcasts}
+    return podcasts, [title for title in titles if title not in found]
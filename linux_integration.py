@@ -1,4 +1,5 @@
 import os
+from models import EpisodeDB
 from PyQt5.QtCore import QObject, pyqtProperty, Q_CLASSINFO, pyqtSlot, QMetaType, pyqtSignal, QTimer
 from PyQt5.QtDBus import QDBusConnection, QDBusAbstractAdaptor, QDBusMessage, QDBusObjectPath, QDBusArgument
 
@@ -6,11 +7,15 @@ from PyQt5.QtDBus import QDBusConnection, QDBusAbstractAdaptor, QDBusMessage, QD
 # Thank you!
 
 
+NO_TRACK = '/org/mpris/MediaPlayer2/TrackList/NoTrack'
+
+
 class mprisIntegration(QObject):
-	def __init__(self, playbackController, current_episode_data, ep_play):
+	def __init__(self, playbackController, current_episode_data, ep_play, playQueue, goTo):
 		super(mprisIntegration, self).__init__()
 		mprisMain(self, playbackController)
-		mprisPlayer(self, playbackController, current_episode_data, ep_play)
+		mprisPlayer(self, playbackController, current_episode_data, ep_play, playQueue, goTo)
+		self.trackList = mprisTrackList(self, playQueue, current_episode_data, goTo)
 		self.connection = QDBusConnection.sessionBus()
 		self.connection.registerObject("/org/mpris/MediaPlayer2", self)
 		self.serviceName = "org.mpris.MediaPlayer2.kodkast"
@@ -35,8 +40,7 @@ class mprisMain(QDBusAbstractAdaptor):
 	
 	@pyqtProperty(bool)
 	def HasTrackList(self):
-		# return True TODO
-		return False
+		return True
 	
 	@pyqtProperty(str)
 	def Identity(self):
@@ -59,6 +63,30 @@ class mprisMain(QDBusAbstractAdaptor):
 		return ['player']
 
 
+def trackPath(episode_id):
+	return QDBusObjectPath('/kodkast/{}'.format(episode_id))
+
+
+def episodeId(trackId):
+	"""Return the episode id in a track's object path, or None if it isn't one of ours."""
+	try:
+		return int(trackId.path().rsplit('/', 1)[-1])
+	except ValueError:
+		return None
+
+
+def episodeData(episode):
+	"""Describe an episode that isn't playing, whose length isn't known yet."""
+	return {
+		'artist': episode.podcast.title,
+		'title': episode.title,
+		'duration': 0,
+		'coverArt': episode.image,
+		'id': episode.id,
+		'track': episode.id,
+	}
+
+
 # noinspection PyArgumentList
 def buildMetadataDict(episode):
 	return {
@@ -76,12 +104,14 @@ def buildMetadataDict(episode):
 class mprisPlayer(QDBusAbstractAdaptor):
 	Q_CLASSINFO("D-Bus Interface", "org.mpris.MediaPlayer2.Player")
 	
-	def __init__(self, parent, playbackController, current_episode_data, ep_play):
+	def __init__(self, parent, playbackController, current_episode_data, ep_play, playQueue, goTo):
 		super(mprisPlayer, self).__init__(parent)
 		self.setAutoRelaySignals(True)
 		self.playbackController = playbackController
 		self.current_episode_data = current_episode_data
 		self.ep_play = ep_play
+		self.playQueue = playQueue
+		self.goTo = goTo
 		self.helper = MPRIS2Helper()
 		self._emitMetadata()
 
@@ -201,6 +231,114 @@ class mprisPlayer(QDBusAbstractAdaptor):
 	def PlayPause(self):
 		self.ep_play.clicked.emit()
 
+	def _nextId(self):
+		current = self.current_episode_data['id']
+		if current in self.playQueue:
+			return self.playQueue.next(current)
+		return self.playQueue.first
+
+	@pyqtProperty(bool)
+	def CanGoNext(self):
+		return self._nextId() is not None
+
+	@pyqtProperty(bool)
+	def CanGoPrevious(self):
+		return self.playQueue.previous(self.current_episode_data['id']) is not None
+
+	@pyqtSlot()
+	def Next(self):
+		if self._nextId() is not None:
+			self.goTo(self._nextId())
+
+	@pyqtSlot()
+	def Previous(self):
+		previous = self.playQueue.previous(self.current_episode_data['id'])
+		if previous is not None:
+			self.goTo(previous)
+
+
+class mprisTrackList(QDBusAbstractAdaptor):
+	"""The play queue, with the playing episode first if it isn't queued."""
+	Q_CLASSINFO("D-Bus Interface", "org.mpris.MediaPlayer2.TrackList")
+
+	def __init__(self, parent, playQueue, current_episode_data, goTo):
+		super(mprisTrackList, self).__init__(parent)
+		self.playQueue = playQueue
+		self.current_episode_data = current_episode_data
+		self.goTo = goTo
+
+	def _episodeIds(self):
+		current = self.current_episode_data['id']
+		if current in self.playQueue:
+			return list(self.playQueue)
+		return [current] + list(self.playQueue)
+
+	@staticmethod
+	def _paths(episode_ids):
+		# PyQt can't declare a QList<QDBusObjectPath>, so the ao array is marshalled by hand
+		paths = QDBusArgument()
+		paths.beginArray(QMetaType.type('QDBusObjectPath'))
+		for episode_id in episode_ids:
+			paths.add(trackPath(episode_id))
+		paths.endArray()
+		return paths
+
+	@pyqtProperty(QDBusArgument)
+	def Tracks(self):
+		return self._paths(self._episodeIds())
+
+	@pyqtProperty(bool)
+	def CanEditTracks(self):
+		return True
+
+	@pyqtSlot(QDBusMessage)
+	def GetTracksMetadata(self, message):
+		# Takes the message for the same reason, and replies with an aa{sv} array of metadata
+		episode_ids = [episodeId(QDBusObjectPath(path)) for path in message.arguments()[0]]
+		episodes = {episode.id: episode for episode in EpisodeDB.select().where(EpisodeDB.id.in_(episode_ids))}
+		metadata = QDBusArgument()
+		metadata.beginArray(QMetaType.QVariantMap)
+		for episode_id in episode_ids:
+			if episode_id == self.current_episode_data['id']:
+				metadata.add(buildMetadataDict(self.current_episode_data), QMetaType.QVariantMap)
+			elif episode_id in episodes:
+				metadata.add(buildMetadataDict(episodeData(episodes[episode_id])), QMetaType.QVariantMap)
+		metadata.endArray()
+		message.setDelayedReply(True)
+		QDBusConnection.sessionBus().send(message.createReply([metadata]))
+
+	@pyqtSlot(str, QDBusObjectPath, bool)
+	def AddTrack(self, uri, afterTrack, setAsCurrent):
+		episode = EpisodeDB.get_or_none(EpisodeDB.url == uri)
+		if episode is None:
+			return
+		after = None if afterTrack.path() == NO_TRACK else episodeId(afterTrack)
+		self.playQueue.insert_after(episode.id, after if after in self.playQueue else None)
+		self.tracksChanged()
+		if setAsCurrent:
+			self.goTo(episode.id)
+
+	@pyqtSlot(QDBusObjectPath)
+	def RemoveTrack(self, trackId):
+		self.playQueue.remove(episodeId(trackId))
+		self.tracksChanged()
+
+	@pyqtSlot(QDBusObjectPath)
+	def GoTo(self, trackId):
+		episode_id = episodeId(trackId)
+		if episode_id in self.playQueue or episode_id == self.current_episode_data['id']:
+			self.goTo(episode_id)
+
+	def tracksChanged(self):
+		"""Tell clients the queue has changed, sending the whole list again."""
+		signal = QDBusMessage.createSignal(
+			"/org/mpris/MediaPlayer2",
+			"org.mpris.MediaPlayer2.TrackList",
+			"TrackListReplaced"
+		)
+		signal.setArguments([self._paths(self._episodeIds()), trackPath(self.current_episode_data['id'])])
+		QDBusConnection.sessionBus().send(signal)
+
 
 # noinspection PyCallByClass
 class MPRIS2Helper(object):
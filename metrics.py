@@ -0,0 +1,112 @@
+import collections
+import contextlib
+import json
+import os
+import threading
+import time
+from models import db_dir
+
+log_path = os.path.join(db_dir, 'metrics.jsonl')
+
+# The log is rotated at LOG_SIZE bytes, keeping LOG_BACKUPS old logs
+LOG_SIZE = 1024 * 1024
+LOG_BACKUPS = 3
+# Records are written in batches of LOG_BATCH, and whenever counters are written
+LOG_BATCH = 50
+
+# Durations kept per operation for the percentiles
+SAMPLES = 500
+
+_lock = threading.Lock()
+_samples = collections.defaultdict(lambda: collections.deque(maxlen=SAMPLES))
+_totals = collections.Counter()
+_counters = collections.Counter()
+_pending = []
+
+
+def _write(line):
+    # Called holding _lock
+    _pending.append(line)
+    if len(_pending) >= LOG_BATCH:
+        _flush()
+
+
+def _flush():
+    # Called holding _lock. The log is only for looking at afterwards, so it
+    # must never break what is being timed
+    try:
+        with open(log_path, 'a') as log_file:
+            log_file.write('\n'.join(_pending) + '\n')
+            size = log_file.tell()
+        if size >= LOG_SIZE:
+            for number in range(LOG_BACKUPS - 1, 0, -1):
+                if os.path.exists('{}.{}'.format(log_path, number)):
+                    os.replace('{}.{}'.format(log_path, number), '{}.{}'.format(log_path, number + 1))
+            os.replace(log_path, log_path + '.1')
+    except OSError:
+        pass
+    _pending.clear()
+
+
+def record(name, seconds, **fields):
+    """Record that an operation took seconds, writing it to the log with any extra fields."""
+    line = json.dumps(dict(time=round(time.time(), 3), span=name, ms=round(seconds * 1000, 3), **fields),
+                      default=str)
+    with _lock:
+        _samples[name].append(seconds)
+        _totals[name] += 1
+        _write(line)
+
+
+@contextlib.contextmanager
+def span(name, **fields):
+    """
+    Time the body of a with block as an operation called name. The dict
+    it yields holds the fields written to the log, and can be added to.
+    A block that raises is recorded with the error.
+    """
+    start = time.perf_counter()
+    try:
+        yield fields
+    except BaseException as e:
+        fields['error'] = type(e).__name__
+        raise
+    finally:
+        record(name, time.perf_counter() - start, **fields)
+
+
+def count(name, amount=1):
+    """Add amount to a counter. Counters are kept in memory and written to the log by write_counters."""
+    with _lock:
+        _counters[name] += amount
+
+
+def write_counters():
+    """Write the counters to the log, along with any records waiting to be written."""
+    with _lock:
+        _pending.append(json.dumps({'time': round(time.time(), 3), 'counters': dict(_counters)}))
+        _flush()
+
+
+def _percentile(ordered, fraction):
+    # Nearest rank, so the result is always a duration that was recorded
+    return ordered[max(int(round(fraction * len(ordered))) - 1, 0)]
+
+
+def summary():
+    """
+    Return (name, count, p50, p95, max) for each operation recorded since
+    start up, by name. The percentiles and max are in seconds, over the
+    last SAMPLES times the operation ran.
+    """
+    with _lock:
+        samples = {name: sorted(durations) for name, durations in _samples.items()}
+        totals = dict(_totals)
+    return [(name, totals[name], _percentile(ordered, 0.5), _percentile(ordered, 0.95), ordered[-1])
+            for name, ordered in sorted(samples.items())]
+
+
+def counters():
+    """Return the counters, by name."""
+    with _lock:
+        return dict(sorted(_counters.items()))
@@ -1,35 +1,392 @@
 import peewee
 import os
+from datetime import datetime
+from playhouse.migrate import SqliteMigrator, migrate
+from playhouse.sqlite_ext import FTS5Model, RowIDField, SearchField
 
 db_name = 'kodkast.db'
 db_dir = os.path.join(os.path.expanduser('~'),'.kodkast')
 if not os.path.isdir(db_dir):
     os.makedirs(db_dir)
 db_path = os.path.join(db_dir, db_name)
-database = peewee.SqliteDatabase(db_path)
+
+# Milliseconds a connection waits for another thread's write lock before failing
+BUSY_TIMEOUT = 5000
+
+
+def database_pragmas(cache_size_mb=16, mmap_size_mb=64):
+    """
+    Return the pragmas applied to every connection. WAL lets readers and
+    a writer on other threads work at the same time, and with
+    synchronous=normal a commit doesn't wait for an fsync; the database
+    is still consistent after a crash, only the last commits may be lost.
+    """
+    return {
+        'journal_mode': 'wal',
+        'synchronous': 'normal',
+        'cache_size': -cache_size_mb * 1024,
+        'mmap_size': mmap_size_mb * 1024 * 1024,
+        'busy_timeout': BUSY_TIMEOUT,
+    }
+
+
+# Connections are per thread. The GUI thread opens one at start up with
+# open_database and keeps it until close_database at exit. Worker threads
+# open one for each unit of work and close it when done: Task.run for the
+# task pool, and DownloadQueue._work for the download workers.
+database = peewee.SqliteDatabase(db_path, pragmas=database_pragmas(), timeout=BUSY_TIMEOUT / 1000)
+
+
+def open_database(cache_size_mb=16, mmap_size_mb=64):
+    """Set the cache sizes for all connections and connect the calling thread."""
+    database.init(db_path, pragmas=database_pragmas(cache_size_mb, mmap_size_mb),
+                  timeout=BUSY_TIMEOUT / 1000)
+    database.connect(reuse_if_open=True)
+
+
+def close_database():
+    """Close the calling thread's connection, checkpointing the WAL if it was the last one."""
+    if not database.is_closed():
+        database.close()
+
 
 class PodcastDB(peewee.Model):
     """
-    A database of podcast titles, urls, and images.
-    """    
-    title = peewee.CharField()
-    url = peewee.CharField()
+    A database of podcast titles, urls, and images, plus the HTTP
+    validators and content hash of the last downloaded feed. art_key
+    names the podcast's image in the artwork cache; rendered is only
+    read to convert databases from before the cache existed.
+    next_refresh is when the feed is next due to be refreshed, in seconds
+    since the epoch, and refresh_failures the number of refreshes in a
+    row that have failed; see schedule.py.
+    """
+    title = peewee.CharField(index=True)
+    url = peewee.CharField(unique=True)
     image = peewee.CharField()
     rendered = peewee.CharField(default="")
+    art_key = peewee.CharField(default="")
+    etag = peewee.CharField(default="")
+    last_modified = peewee.CharField(default="")
+    content_hash = peewee.CharField(default="")
+    next_refresh = peewee.FloatField(default=0, index=True)
+    refresh_failures = peewee.IntegerField(default=0)
 
     class Meta:
         database = database
 
 class EpisodeDB(peewee.Model):
     """
-    A database of podcast ids, episode titles, publish dates, urls, images, and durations
+    A database of podcast ids, episode titles, descriptions, publish dates, urls, images, and durations.
+    guid is the feed's guid for the episode, or its url if the feed has none.
+    description is the feed's show notes as plain text.
     """
     podcast = peewee.ForeignKeyField(PodcastDB)
-    title = peewee.CharField()
+    title = peewee.CharField(index=True)
     pub_date = peewee.DateField()
     url = peewee.CharField()
     image = peewee.CharField()
     bookmark = peewee.IntegerField()
+    guid = peewee.CharField(default="")
+    description = peewee.TextField(default="")
+
+    class Meta:
+        database = database
+        indexes = (
+            (('podcast', 'pub_date'), False),
+            (('podcast', 'guid'), True),
+        )
+
+
+class EpisodeSearchDB(FTS5Model):
+    """
+    The full-text index of episode titles and descriptions, one row per
+    episode with the episode's id as its rowid. Kept in step with
+    EpisodeDB by the feed merge; see search.py.
+    """
+    rowid = RowIDField()
+    title = SearchField()
+    description = SearchField()
+
+    class Meta:
+        database = database
+        # Prefix indexes keep searching as you type fast for short words
+        options = {'tokenize': 'unicode61 remove_diacritics 2', 'prefix': '2 3'}
+
+
+class DownloadDB(peewee.Model):
+    """
+    A persistent queue of episodes waiting to be downloaded, with their
+    priority and the state of the last attempt.
+    """
+    episode = peewee.ForeignKeyField(EpisodeDB, unique=True, on_delete='CASCADE')
+    priority = peewee.IntegerField(default=0)
+    status = peewee.CharField(default='queued')
+    error = peewee.CharField(default="")
+    added = peewee.DateTimeField(default=datetime.now)
+
+    class Meta:
+        database = database
+
+
+class LocalFileDB(peewee.Model):
+    """
+    The download index: where each downloaded episode is stored, its
+    size in bytes and the SHA-256 of its contents. The checksum is empty
+    for files found on disk rather than written by the downloader.
+    """
+    episode = peewee.ForeignKeyField(EpisodeDB, unique=True, on_delete='CASCADE')
+    path = peewee.CharField(unique=True)
+    size = peewee.IntegerField()
+    checksum = peewee.CharField(default="")
+
+    class Meta:
+        database = database
+
+
+class ArtworkDB(peewee.Model):
+    """
+    Maps image urls to their key in the artwork cache, so an image
+    is only downloaded once.
+    """
+    url = peewee.CharField(unique=True)
+    key = peewee.CharField()
 
     class Meta:
         database = database
+
+
+class ResponseDB(peewee.Model):
+    """
+    Cached responses from the iTunes API and podcast feeds, stored as
+    JSON under their endpoint and query. fetched is when the response
+    was downloaded and used when it was last read, both in seconds since
+    the epoch; size is the length of body.
+    """
+    key = peewee.CharField(unique=True)
+    body = peewee.TextField()
+    size = peewee.IntegerField()
+    fetched = peewee.FloatField()
+    used = peewee.FloatField(index=True)
+
+    class Meta:
+        database = database
+
+
+class QueueDB(peewee.Model):
+    """
+    The play queue, episodes to play one after another across podcasts,
+    in order of position.
+    """
+    episode = peewee.ForeignKeyField(EpisodeDB, unique=True, on_delete='CASCADE')
+    position = peewee.IntegerField(index=True)
+
+    class Meta:
+        database = database
+
+
+class SchemaVersionDB(peewee.Model):
+    """
+    A single row holding the number of migrations applied to the database.
+    """
+    version = peewee.IntegerField()
+
+    class Meta:
+        database = database
+
+
+MODELS = [SchemaVersionDB, PodcastDB, EpisodeDB, DownloadDB, ArtworkDB, QueueDB, LocalFileDB, EpisodeSearchDB,
+          ResponseDB]
+
+
+def _add_columns(model):
+    """Add any of a model's columns missing from its table."""
+    db = model._meta.database
+    migrator = SqliteMigrator(db)
+    table = model._meta.table_name
+    existing = {column.name for column in db.get_columns(table)}
+    for field in model._meta.sorted_fields:
+        if field.column_name not in existing:
+            migrate(migrator.add_column(table, field.column_name, field))
+
+
+def _frozen(table_name, fields, indexes=(), base=peewee.Model, **options):
+    """
+    Return a model of a table as a migration leaves it. Migrations work
+    on these rather than the models above, so changing a model can't
+    change what a released migration does; new columns, tables and
+    indexes need a new migration.
+    """
+    meta = type('Meta', (), dict(database=SchemaVersionDB._meta.database, table_name=table_name,
+                                 indexes=indexes, **options))
+    return type(table_name, (base,), dict(fields, Meta=meta))
+
+
+def _podcast_table(schedule=False):
+    fields = {
+        'title': peewee.CharField(index=True),
+        'url': peewee.CharField(unique=True),
+        'image': peewee.CharField(),
+        'rendered': peewee.CharField(default=""),
+        'art_key': peewee.CharField(default=""),
+        'etag': peewee.CharField(default=""),
+        'last_modified': peewee.CharField(default=""),
+        'content_hash': peewee.CharField(default=""),
+    }
+    if schedule:
+        # Added by _migration_schedule
+        fields['next_refresh'] = peewee.FloatField(default=0, index=True)
+        fields['refresh_failures'] = peewee.IntegerField(default=0)
+    return _frozen('podcastdb', fields)
+
+
+def _episode_table(podcast_table, descriptions=False):
+    fields = {
+        'podcast': peewee.ForeignKeyField(podcast_table),
+        'title': peewee.CharField(index=True),
+        'pub_date': peewee.DateField(),
+        'url': peewee.CharField(),
+        'image': peewee.CharField(),
+        'bookmark': peewee.IntegerField(),
+        'guid': peewee.CharField(default=""),
+    }
+    if descriptions:
+        # Added by _migration_search
+        fields['description'] = peewee.TextField(default="")
+    return _frozen('episodedb', fields, indexes=((('podcast', 'pub_date'), False), (('podcast', 'guid'), True)))
+
+
+def _first_tables():
+    """Return the podcast, episode, download and artwork tables as the first two migrations leave them."""
+    podcasts = _podcast_table()
+    episodes = _episode_table(podcasts)
+    downloads = _frozen('downloaddb', {
+        'episode': peewee.ForeignKeyField(episodes, unique=True, on_delete='CASCADE'),
+        'priority': peewee.IntegerField(default=0),
+        'status': peewee.CharField(default='queued'),
+        'error': peewee.CharField(default=""),
+        'added': peewee.DateTimeField(default=datetime.now),
+    })
+    artwork = _frozen('artworkdb', {
+        'url': peewee.CharField(unique=True),
+        'key': peewee.CharField(),
+    })
+    return podcasts, episodes, downloads, artwork
+
+
+def _migration_tables():
+    """Create the tables, and add columns from before schema versions were recorded."""
+    for table in _first_tables():
+        table._schema.create_table(safe=True)
+        _add_columns(table)
+
+
+def _migration_indexes():
+    """
+    Fill in episode guids and add the indexes and unique constraints,
+    removing any duplicate podcasts and episodes that would break them.
+    The oldest copy of each is kept.
+    """
+    podcasts, episodes, downloads, artwork = _first_tables()
+    episodes.update(guid=episodes.url).where(episodes.guid == "").execute()
+
+    first_podcasts = podcasts.select(peewee.fn.MIN(podcasts.id)).group_by(podcasts.url)
+    duplicate_podcasts = podcasts.select(podcasts.id).where(podcasts.id.not_in(first_podcasts))
+    first_episodes = episodes.select(peewee.fn.MIN(episodes.id)).group_by(episodes.podcast, episodes.guid)
+    duplicate_episodes = episodes.select(episodes.id).where(
+        episodes.id.not_in(first_episodes) | episodes.podcast.in_(duplicate_podcasts))
+    downloads.delete().where(downloads.episode.in_(duplicate_episodes)).execute()
+    episodes.delete().where(episodes.id.in_(duplicate_episodes)).execute()
+    podcasts.delete().where(podcasts.id.in_(duplicate_podcasts)).execute()
+
+    for table in (podcasts, episodes, downloads, artwork):
+        table._schema.create_indexes(safe=True)
+
+
+def _migration_queue():
+    """Add the play queue."""
+    episodes = _episode_table(_podcast_table())
+    _frozen('queuedb', {
+        'episode': peewee.ForeignKeyField(episodes, unique=True, on_delete='CASCADE'),
+        'position': peewee.IntegerField(index=True),
+    }).create_table(safe=True)
+
+
+def _migration_download_index():
+    """Add the download index, filled in from the download folders at startup."""
+    episodes = _episode_table(_podcast_table())
+    _frozen('localfiledb', {
+        'episode': peewee.ForeignKeyField(episodes, unique=True, on_delete='CASCADE'),
+        'path': peewee.CharField(unique=True),
+        'size': peewee.IntegerField(),
+        'checksum': peewee.CharField(default=""),
+    }).create_table(safe=True)
+
+
+def _migration_search():
+    """
+    Add episode descriptions and the search index, indexing the stored
+    titles. The feed validators are cleared so every feed is merged on
+    its next refresh, which fills in the descriptions.
+    """
+    podcasts = _podcast_table()
+    episodes = _episode_table(podcasts, descriptions=True)
+    _add_columns(episodes)
+    podcasts.update(etag="", last_modified="", content_hash="").execute()
+    search = _frozen('episodesearchdb', {
+        'rowid': RowIDField(),
+        'title': SearchField(),
+        'description': SearchField(),
+    }, base=FTS5Model, options={'tokenize': 'unicode61 remove_diacritics 2', 'prefix': '2 3'})
+    search.create_table(safe=True)
+    search.delete().execute()
+    search.insert_from(
+        episodes.select(episodes.id, episodes.title, episodes.description),
+        [search.rowid, search.title, search.description]).execute()
+
+
+def _migration_response_cache():
+    """Add the response cache."""
+    _frozen('responsedb', {
+        'key': peewee.CharField(unique=True),
+        'body': peewee.TextField(),
+        'size': peewee.IntegerField(),
+        'fetched': peewee.FloatField(),
+        'used': peewee.FloatField(index=True),
+    }).create_table(safe=True)
+
+
+def _migration_schedule():
+    """Add the refresh schedule. Every podcast starts out due."""
+    podcasts = _podcast_table(schedule=True)
+    _add_columns(podcasts)
+    podcasts._schema.create_indexes(safe=True)
+
+
+# Applied in order; the schema version is the number that have been applied.
+# Never change or reorder these once released, only add new ones.
+MIGRATIONS = [
+    _migration_tables,
+    _migration_indexes,
+    _migration_queue,
+    _migration_download_index,
+    _migration_search,
+    _migration_response_cache,
+    _migration_schedule,
+]
+
+
+def migrate_database():
+    """
+    Bring the database schema up to date, applying each migration not
+    yet recorded in SchemaVersionDB in its own transaction.
+    """
+    db = SchemaVersionDB._meta.database
+    SchemaVersionDB.create_table()
+    current = SchemaVersionDB.get_or_none()
+    if current is None:
+        current = SchemaVersionDB.create(version=0)
+    for version in range(current.version, len(MIGRATIONS)):
+        with db.atomic():
+            MIGRATIONS[version]()
+            current.version = version + 1
+            current.save()
@@ -0,0 +1,169 @@
+import itertools
+import time
+import vlc
+import metrics
+from PyQt5 import QtCore as qtc
+
+# libVLC events forwarded as signals, with how to read each event's value
+EVENTS = [
+    (vlc.EventType.MediaPlayerPlaying, 'playing', None),
+    (vlc.EventType.MediaPlayerPaused, 'paused', None),
+    (vlc.EventType.MediaPlayerTimeChanged, 'time_changed', lambda event: event.u.new_time),
+    (vlc.EventType.MediaPlayerLengthChanged, 'length_changed', lambda event: event.u.new_length),
+    (vlc.EventType.MediaPlayerBuffering, 'buffering', lambda event: event.u.new_cache),
+    (vlc.EventType.MediaPlayerEndReached, 'end_reached', None),
+    (vlc.EventType.MediaPlayerEncounteredError, 'error', None),
+]
+
+
+class PlaybackController(qtc.QObject):
+    """
+    Plays one episode at a time with libVLC and reports what the player
+    is doing through Qt signals, driven by libVLC's events instead of
+    polling the player.
+
+    libVLC sends events from its own threads and must not be called
+    back from inside them, so each event is only turned into a signal,
+    which Qt queues to the GUI thread.
+
+    The next episode can be preloaded into a second, muted player, which
+    is paused at its start position as soon as it has buffered enough to
+    play. play_next then switches to it without waiting for it to open.
+
+    Times and lengths are in milliseconds, buffering in percent.
+    """
+    playing = qtc.pyqtSignal()
+    paused = qtc.pyqtSignal()
+    time_changed = qtc.pyqtSignal(int)
+    length_changed = qtc.pyqtSignal(int)
+    buffering = qtc.pyqtSignal(float)
+    end_reached = qtc.pyqtSignal()
+    error = qtc.pyqtSignal()
+    _event = qtc.pyqtSignal(int, str, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.instance = vlc.Instance()
+        self.rate = 1
+        # Each player's events carry its token, so events still queued from
+        # a player that has been replaced can be dropped
+        self.tokens = itertools.count()
+        self._event.connect(self._dispatch)
+        self.player, self.token, self.events = self._new_player()
+        self.next_player = self.next_token = self.next_events = None
+        self.next_start = 0
+        # When play was last asked for, until libVLC reports that it is playing
+        self.play_requested = None
+        # The rate is reset whenever new media starts
+        self.playing.connect(lambda: self.player.set_rate(self.rate))
+
+    def _new_player(self, location=None, start_time=0):
+        player = self.instance.media_player_new()
+        if location:
+            media = self.instance.media_new(location)
+            if start_time > 0:
+                # Let libVLC seek as it opens the media, rather than waiting for it to start playing
+                media.add_option('start-time={}'.format(start_time / 1000))
+            player.set_media(media)
+        token = next(self.tokens)
+        # Keep a reference, the event manager owns the callbacks libVLC calls
+        events = player.event_manager()
+        for event_type, signal_name, value in EVENTS:
+            events.event_attach(event_type, self._forwarder(token, signal_name, value))
+        return player, token, events
+
+    def _forwarder(self, token, signal_name, value):
+        return lambda event: self._event.emit(token, signal_name, value(event) if value else None)
+
+    def _dispatch(self, token, signal_name, value):
+        if token == self.next_token:
+            if signal_name == 'playing':
+                # Hold the preloaded episode now that it can start straight away
+                self.next_player.set_pause(1)
+                self.next_player.set_time(self.next_start)
+            return
+        if token != self.token:
+            return
+        if signal_name == 'playing' and self.play_requested is not None:
+            metrics.record('play.buffering', time.perf_counter() - self.play_requested)
+            self.play_requested = None
+        signal = getattr(self, signal_name)
+        if value is None:
+            signal.emit()
+        else:
+            signal.emit(value)
+
+    @staticmethod
+    def _release(player):
+        if player is not None:
+            player.stop()
+            player.release()
+
+    def load(self, location, start_time=0):
+        """Open a file or URL, to be played from start_time, dropping any preloaded episode."""
+        self._release(self.player)
+        self.clear_next()
+        self.player, self.token, self.events = self._new_player(location, start_time)
+
+    def preload(self, location, start_time=0):
+        """Start buffering the episode to play after this one, from start_time."""
+        self.clear_next()
+        self.next_player, self.next_token, self.next_events = self._new_player(location, start_time)
+        self.next_start = start_time
+        self.next_player.audio_set_mute(True)
+        self.next_player.play()
+
+    def clear_next(self):
+        self._release(self.next_player)
+        self.next_player = self.next_token = self.next_events = None
+
+    def play_next(self):
+        """Switch to the preloaded episode and play it. Returns False if there isn't one."""
+        if self.next_player is None:
+            return False
+        self._release(self.player)
+        self.player, self.token, self.events = self.next_player, self.next_token, self.next_events
+        self.next_player = self.next_token = self.next_events = None
+        self.player.audio_set_mute(False)
+        self.play_requested = time.perf_counter()
+        self.player.play()
+        # Its length was reported while it was preloading, when its events were held back
+        if self.player.get_length() > 0:
+            self.length_changed.emit(self.player.get_length())
+        return True
+
+    def play(self):
+        """Start the loaded media, or resume it if paused."""
+        self.play_requested = time.perf_counter()
+        self.player.play()
+
+    def pause(self):
+        self.player.set_pause(1)
+
+    def stop(self):
+        self.player.stop()
+
+    def is_playing(self):
+        return bool(self.player.is_playing())
+
+    def get_time(self):
+        return self.player.get_time()
+
+    def set_time(self, time):
+        self.player.set_time(int(time))
+
+    def get_length(self):
+        return self.player.get_length()
+
+    def get_position(self):
+        return self.player.get_position()
+
+    def set_position(self, position):
+        self.player.set_position(position)
+
+    def get_rate(self):
+        return self.rate
+
+    def set_rate(self, rate):
+        self.rate = rate
+        self.player.set_rate(rate)
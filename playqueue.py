@@ -0,0 +1,117 @@
+import peewee
+from models import database, EpisodeDB, QueueDB
+
+
+class PlayQueue:
+    """
+    The episodes to play one after another, across podcasts, kept in
+    QueueDB so the queue survives restarts.
+
+    In memory the queue is a doubly linked list of episode ids, so
+    looking up the episode after or before another, adding and removing
+    are O(1). Each change rewrites the positions in one transaction; the
+    queue is short and only changed by the user.
+    """
+
+    def __init__(self):
+        self.first = None
+        self.last = None
+        self.next_ids = {}
+        self.previous_ids = {}
+
+    def load(self):
+        """Read the queue from the database, dropping episodes that have since been deleted."""
+        QueueDB.delete().where(QueueDB.episode.not_in(EpisodeDB.select(EpisodeDB.id))).execute()
+        self.first = self.last = None
+        self.next_ids, self.previous_ids = {}, {}
+        for (episode_id,) in QueueDB.select(QueueDB.episode).order_by(QueueDB.position).tuples():
+            self._link(episode_id, self.last)
+
+    def __contains__(self, episode_id):
+        return episode_id in self.next_ids
+
+    def __len__(self):
+        return len(self.next_ids)
+
+    def __iter__(self):
+        episode_id = self.first
+        while episode_id is not None:
+            yield episode_id
+            episode_id = self.next_ids[episode_id]
+
+    def next(self, episode_id):
+        """Return the episode id queued after episode_id, or None."""
+        return self.next_ids.get(episode_id)
+
+    def previous(self, episode_id):
+        """Return the episode id queued before episode_id, or None."""
+        return self.previous_ids.get(episode_id)
+
+    def append(self, episode_id):
+        """Add an episode to the end of the queue, moving it there if it is already queued."""
+        self.insert_after(episode_id, self.last if self.last != episode_id else self.previous(episode_id))
+
+    def insert_after(self, episode_id, after=None):
+        """Queue an episode after another queued episode, or first if after is None."""
+        if episode_id == after:
+            return
+        self._unlink(episode_id)
+        self._link(episode_id, after)
+        self._save()
+
+    def move(self, episode_id, index):
+        """Move a queued episode to index, as when it is dragged in the queue view."""
+        self._unlink(episode_id)
+        after = None
+        for i, queued_id in enumerate(self):
+            if i == index:
+                break
+            after = queued_id
+        self._link(episode_id, after)
+        self._save()
+
+    def remove(self, *episode_ids):
+        """Take episodes off the queue, ignoring any that aren't queued."""
+        removed = [episode_id for episode_id in episode_ids if self._unlink(episode_id)]
+        if removed:
+            self._save()
+
+    def clear(self):
+        self.first = self.last = None
+        self.next_ids, self.previous_ids = {}, {}
+        self._save()
+
+    def _link(self, episode_id, after):
+        following = self.next_ids[after] if after is not None else self.first
+        self.previous_ids[episode_id] = after
+        self.next_ids[episode_id] = following
+        if after is None:
+            self.first = episode_id
+        else:
+            self.next_ids[after] = episode_id
+        if following is None:
+            self.last = episode_id
+        else:
+            self.previous_ids[following] = episode_id
+
+    def _unlink(self, episode_id):
+        if episode_id not in self.next_ids:
+            return False
+        before = self.previous_ids.pop(episode_id)
+        following = self.next_ids.pop(episode_id)
+        if before is None:
+            self.first = following
+        else:
+            self.next_ids[before] = following
+        if following is None:
+            self.last = before
+        else:
+            self.previous_ids[following] = before
+        return True
+
+    def _save(self):
+        rows = [{'episode': episode_id, 'position': position} for position, episode_id in enumerate(self)]
+        with database.atomic():
+            QueueDB.delete().execute()
+            for batch in peewee.chunked(rows, 100):
+                QueueDB.insert_many(batch).execute()
@@ -0,0 +1,112 @@
+import collections
+import urllib.parse
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import requests
+import feeds
+import schedule
+from models import PodcastDB
+
+# Feeds downloaded at the same time, overall and from any one host
+REFRESH_WORKERS = 8
+REFRESH_PER_HOST = 2
+
+
+def make_session(pool_size=REFRESH_WORKERS):
+    """
+    Create a requests Session whose connection pool can keep a
+    connection open for every worker.
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def feed_host(url):
+    return urllib.parse.urlsplit(url).netloc.lower()
+
+
+def refresh_podcast(podcast, headers=None):
+    """
+    Refresh one podcast as refresh_all does, and schedule its next
+    refresh. Returns the merge_episodes result, or raises the error that
+    stopped the podcast refreshing.
+    """
+    try:
+        result = feeds.refresh_podcast(podcast, headers)
+    except Exception:
+        schedule.reschedule(podcast, failed=True)
+        raise
+    schedule.reschedule(podcast)
+    return result
+
+
+def refresh_all(podcasts=None, headers=None, workers=REFRESH_WORKERS, per_host=REFRESH_PER_HOST,
+                timeout=feeds.FEED_TIMEOUT, progress=None, cancelled=None):
+    """
+    Refresh every podcast, or every subscribed podcast if none are given.
+
+    Feeds are downloaded concurrently on a pool of worker threads that
+    share one pooled Session. A feed is only handed to the pool once its
+    host has fewer than per_host downloads running, so feeds from one
+    busy host wait without holding up feeds from the others. Each
+    download is merged on the calling thread as it completes, so only
+    one thread writes to the database, and the podcast's next refresh is
+    scheduled.
+    progress, if given, is called after each podcast with
+    (done, total, podcast, result), result being what is returned for
+    that podcast. cancelled, if given, is polled between podcasts and
+    stops the refresh when it returns True.
+
+    Returns a dict mapping podcast ids to the merge_episodes result, or
+    to the exception that stopped that podcast from refreshing.
+    """
+    podcasts = list(PodcastDB.select() if podcasts is None else podcasts)
+    waiting = collections.defaultdict(collections.deque)
+    for podcast in podcasts:
+        waiting[feed_host(podcast.url)].append(podcast)
+    running = collections.Counter()
+    futures = {}
+    results = {}
+
+    def submit_ready():
+        for host, queue in waiting.items():
+            while queue and running[host] < per_host:
+                podcast = queue.popleft()
+                running[host] += 1
+                future = executor.submit(feeds.fetch_feed_if_changed, podcast, headers, session, timeout)
+                futures[future] = podcast
+
+    with make_session(workers) as session, ThreadPoolExecutor(max_workers=workers) as executor:
+        submit_ready()
+        done = 0
+        while futures and not (cancelled and cancelled()):
+            finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in finished:
+                podcast = futures.pop(future)
+                running[feed_host(podcast.url)] -= 1
+                done += 1
+                try:
+                    body, cache = future.result()
+                    results[podcast.id] = feeds.apply_feed(podcast, body, cache)
+                except Exception as e:
+                    # One broken feed must not stop the rest of the library refreshing
+                    results[podcast.id] = e
+                schedule.reschedule(podcast, failed=isinstance(results[podcast.id], Exception))
+                if progress:
+                    progress(done, len(podcasts), podcast, results[podcast.id])
+                if cancelled and cancelled():
+                    break
+            else:
+                submit_ready()
+        # When cancelled, feeds already downloaded are dropped unmerged
+        for future in futures:
+            future.cancel()
+        executor.shutdown()
+        for future in futures:
+            if not future.cancelled() and future.exception() is None:
+                body, cache = future.result()
+                if body is not None:
+                    body.close()
+    return results
@@ -0,0 +1,123 @@
+import collections
+import json
+import threading
+import time
+import peewee
+import metrics
+from models import database, ResponseDB
+
+HOUR = 60 * 60
+
+# Seconds a response is fresh for, by endpoint
+TTLS = {
+    'search': 24 * HOUR,
+    'lookup': 7 * 24 * HOUR,
+    'top100': 6 * HOUR,
+    'channel': HOUR,
+}
+
+
+class ResponseCache:
+    """
+    Responses from the iTunes API and podcast feeds kept in ResponseDB,
+    so going back to a search, the Top 100 or a podcast's details is
+    instant and works offline.
+
+    A response is fresh for its endpoint's TTL. After that it is still
+    returned straight away, but fetched again in the background so the
+    next request gets the new one; if that fails the old response is
+    kept. The least recently used responses are deleted once the cache
+    grows past max_bytes.
+
+    Every request is counted as a hit, a stale hit or a miss.
+    """
+
+    def __init__(self, max_bytes=5 * 1024 * 1024, ttls=None):
+        self.max_bytes = max_bytes
+        self.ttls = ttls or TTLS
+        self.lock = threading.Lock()
+        self.counts = collections.Counter()
+        self.refreshing = set()
+
+    def get(self, endpoint, query, fetch):
+        """
+        Return the response for query from endpoint, calling fetch() to
+        download it only if it isn't cached. fetch must return a value
+        that can be stored as JSON.
+        """
+        key = '{}:{}'.format(endpoint, query)
+        cached = ResponseDB.get_or_none(ResponseDB.key == key)
+        if cached is None:
+            self._count('miss')
+            response = fetch()
+            self._store(key, response)
+            return response
+        now = time.time()
+        ResponseDB.update(used=now).where(ResponseDB.id == cached.id).execute()
+        if now - cached.fetched > self.ttls[endpoint]:
+            self._count('stale')
+            self._revalidate(key, fetch)
+        else:
+            self._count('hit')
+        return json.loads(cached.body)
+
+    def stats(self):
+        """Return the number of hits, stale hits and misses so far."""
+        with self.lock:
+            return {name: self.counts[name] for name in ('hit', 'stale', 'miss')}
+
+    def hit_rate(self):
+        """Return the fraction of requests answered from the cache, or None before the first."""
+        stats = self.stats()
+        total = sum(stats.values())
+        return (stats['hit'] + stats['stale']) / total if total else None
+
+    def clear(self):
+        ResponseDB.delete().execute()
+
+    def _count(self, name):
+        with self.lock:
+            self.counts[name] += 1
+        metrics.count('responses.' + name)
+
+    def _revalidate(self, key, fetch):
+        with self.lock:
+            if key in self.refreshing:
+                return
+            self.refreshing.add(key)
+        threading.Thread(target=self._refresh, args=(key, fetch), name='revalidate', daemon=True).start()
+
+    def _refresh(self, key, fetch):
+        try:
+            response = fetch()
+            with database.connection_context():
+                self._store(key, response)
+        except Exception:
+            # Offline or the server is down; keep serving the stale response
+            pass
+        finally:
+            with self.lock:
+                self.refreshing.discard(key)
+
+    def _store(self, key, response):
+        body = json.dumps(response)
+        now = time.time()
+        ResponseDB.insert(key=key, body=body, size=len(body), fetched=now, used=now).on_conflict(
+            conflict_target=[ResponseDB.key],
+            update={ResponseDB.body: body, ResponseDB.size: len(body), ResponseDB.fetched: now,
+                    ResponseDB.used: now}).execute()
+        total = ResponseDB.select(peewee.fn.SUM(ResponseDB.size)).scalar() or 0
+        if total > self.max_bytes:
+            self._evict(total)
+
+    def _evict(self, total):
+        # Trim to 90% of the limit so every new response doesn't trigger another pass
+        target = self.max_bytes * 0.9
+        evicted = []
+        for response_id, size in ResponseDB.select(ResponseDB.id, ResponseDB.size).order_by(ResponseDB.used).tuples():
+            if total <= target:
+                break
+            evicted.append(response_id)
+            total -= size
+        for batch in peewee.chunked(evicted, 500):
+            ResponseDB.delete().where(ResponseDB.id.in_(batch)).execute()
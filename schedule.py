@@ -0,0 +1,76 @@
+import random
+import statistics
+import time
+import peewee
+from models import PodcastDB, EpisodeDB
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# A feed is checked this often relative to the median gap between its
+# recent episodes, within MIN_INTERVAL and MAX_INTERVAL
+CADENCE_FRACTION = 0.25
+CADENCE_EPISODES = 10
+MIN_INTERVAL = HOUR
+MAX_INTERVAL = DAY
+# For feeds with too few episodes to tell
+DEFAULT_INTERVAL = 6 * HOUR
+
+# Feeds that haven't published for this long are only checked weekly
+DORMANT_AFTER = 90 * DAY
+DORMANT_INTERVAL = 7 * DAY
+
+# Each failed refresh doubles the wait, up to MAX_BACKOFF
+MAX_BACKOFF = 7 * DAY
+
+# Each wait is randomly up to this fraction longer or shorter, so feeds
+# added or refreshed together drift apart instead of all falling due at once
+JITTER = 0.1
+
+
+def refresh_interval(podcast, now=None):
+    """Return the seconds to wait between refreshes of a podcast, from how often it publishes."""
+    now = time.time() if now is None else now
+    query = (EpisodeDB.select(EpisodeDB.pub_date).where(EpisodeDB.podcast == podcast)
+             .order_by(EpisodeDB.pub_date.desc()).limit(CADENCE_EPISODES + 1).tuples())
+    dates = [pub_date for (pub_date,) in query]
+    if len(dates) < 2:
+        return DEFAULT_INTERVAL
+    newest = time.mktime(dates[0].timetuple())
+    if now - newest > DORMANT_AFTER:
+        return DORMANT_INTERVAL
+    gap = statistics.median((newer - older).days * DAY for newer, older in zip(dates, dates[1:]))
+    return min(max(gap * CADENCE_FRACTION, MIN_INTERVAL), MAX_INTERVAL)
+
+
+def reschedule(podcast, failed=False, now=None):
+    """
+    Set when a podcast that has just been refreshed is next due. A
+    failed refresh backs off exponentially, and a successful one starts
+    the count again.
+    """
+    now = time.time() if now is None else now
+    failures = podcast.refresh_failures + 1 if failed else 0
+    wait = min(refresh_interval(podcast, now) * 2 ** failures, MAX_BACKOFF)
+    wait *= random.uniform(1 - JITTER, 1 + JITTER)
+    podcast.next_refresh = now + wait
+    podcast.refresh_failures = failures
+    podcast.save(only=[PodcastDB.next_refresh, PodcastDB.refresh_failures])
+
+
+def due_podcasts(now=None):
+    """Return the podcasts due to be refreshed, longest overdue first."""
+    now = time.time() if now is None else now
+    return list(PodcastDB.select().where(PodcastDB.next_refresh <= now).order_by(PodcastDB.next_refresh))
+
+
+def is_due(podcast, now=None):
+    now = time.time() if now is None else now
+    return PodcastDB.select().where((PodcastDB.id == podcast.id) & (PodcastDB.next_refresh <= now)).exists()
+
+
+def seconds_until_due(now=None):
+    """Return the seconds until the next podcast is due, 0 if one is already, or None if there are none."""
+    now = time.time() if now is None else now
+    next_refresh = PodcastDB.select(peewee.fn.MIN(PodcastDB.next_refresh)).scalar()
+    return None if next_refresh is None else max(next_refresh - now, 0)
@@ -0,0 +1,89 @@
+import re
+import peewee
+import metrics
+from models import EpisodeDB, PodcastDB, EpisodeSearchDB
+
+# Search results read at a time
+PAGE_SIZE = 50
+
+# Ranking is the slow part of a search, so when a search matches more
+# episodes than this only the most recently added are ranked and shown
+RANKED_MATCHES = 2000
+
+# Letters the last word needs before it is matched as a prefix. Shorter
+# prefixes aren't in the index's prefix tables, and match nearly everything
+MIN_PREFIX = 2
+
+# How much more a match in the title counts than one in the description
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+# Rows per statement, kept well under SQLite's bound variable limit
+BATCH_SIZE = 500
+
+_WORD = re.compile(r'\w+')
+
+
+def match_expression(text):
+    """
+    Turn what was typed into a search into an FTS5 query for episodes
+    containing every word. The last word is matched as a prefix unless
+    it is followed by a space, since it may still be being typed, and
+    is left out until it is MIN_PREFIX letters long. Returns None if
+    there are no words to search for.
+    """
+    words = _WORD.findall(text)
+    # Words are quoted so FTS5 doesn't read them as operators such as AND or NEAR
+    terms = ['"{}"'.format(word) for word in words]
+    if terms and not text[-1].isspace():
+        if len(words[-1]) < MIN_PREFIX:
+            terms.pop()
+        else:
+            terms[-1] += '*'
+    return ' '.join(terms) or None
+
+
+def search_episodes(text, offset=0, limit=PAGE_SIZE):
+    """
+    Return a page of the episodes matching a search, best match first,
+    as (episode id, title, podcast title, publish date, snippet) tuples.
+    snippet is the part of the description that matched, if any.
+    """
+    expression = match_expression(text)
+    if expression is None:
+        return []
+    with metrics.span('search', offset=offset):
+        return _search(expression, offset, limit)
+
+
+def _search(expression, offset, limit):
+    matches = EpisodeSearchDB.match(expression)
+    # Finding the RANKED_MATCHES-th most recent match only walks the index, unlike ranking
+    cutoff = (EpisodeSearchDB.select(EpisodeSearchDB.rowid).where(matches)
+              .order_by(EpisodeSearchDB.rowid.desc()).offset(RANKED_MATCHES - 1).limit(1).scalar())
+    if cutoff is not None:
+        matches &= EpisodeSearchDB.rowid >= cutoff
+    snippet = peewee.fn.snippet(EpisodeSearchDB._meta.entity, 1, '', '', '…', 12)
+    query = (EpisodeSearchDB
+             .select(EpisodeSearchDB.rowid, EpisodeDB.title, PodcastDB.title, EpisodeDB.pub_date, snippet)
+             .join(EpisodeDB, on=(EpisodeDB.id == EpisodeSearchDB.rowid))
+             .join(PodcastDB, on=(PodcastDB.id == EpisodeDB.podcast))
+             .where(matches)
+             .order_by(EpisodeSearchDB.bm25(TITLE_WEIGHT, DESCRIPTION_WEIGHT), EpisodeDB.pub_date.desc())
+             .offset(offset)
+             .limit(limit)
+             .tuples())
+    return list(query)
+
+
+def index_episodes(where):
+    """Add the episodes matching a where clause on EpisodeDB to the search index."""
+    EpisodeSearchDB.insert_from(
+        EpisodeDB.select(EpisodeDB.id, EpisodeDB.title, EpisodeDB.description).where(where),
+        [EpisodeSearchDB.rowid, EpisodeSearchDB.title, EpisodeSearchDB.description]).execute()
+
+
+def unindex_episodes(episode_ids):
+    """Remove episodes from the search index."""
+    for batch in peewee.chunked(list(episode_ids), BATCH_SIZE):
+        EpisodeSearchDB.delete().where(EpisodeSearchDB.rowid.in_(batch)).execute()
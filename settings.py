@@ -0,0 +1,46 @@
+import json
+import os
+from models import db_dir
+
+settings_path = os.path.join(db_dir, 'settings.json')
+
+DEFAULTS = {
+    # Episodes downloaded at the same time
+    'download_workers': 3,
+    # Combined download speed limit in KB/s, 0 for no limit
+    'download_rate_limit': 0,
+    # Size of the artwork cache in MB before old images are removed
+    'artwork_cache_size': 200,
+    # Size of the iTunes and feed response cache in MB before the least recently used are removed
+    'response_cache_size': 5,
+    # SQLite page cache and memory mapped I/O per connection, in MB
+    'database_cache_size': 16,
+    'database_mmap_size': 64,
+    # Seconds between bookmark saves, the most progress lost if Kodkast crashes
+    'bookmark_interval': 5,
+    # Seconds before the end of an episode to start buffering the next one, 0 to turn off
+    'preload_lookahead': 30,
+}
+
+_settings = None
+
+
+def value(name):
+    """Return a setting, falling back to its default."""
+    global _settings
+    if _settings is None:
+        _settings = dict(DEFAULTS)
+        try:
+            with open(settings_path) as settings_file:
+                _settings.update(json.load(settings_file))
+        except (OSError, ValueError):
+            pass
+    return _settings[name]
+
+
+def set_value(name, new_value):
+    """Change a setting and save all settings to disk."""
+    value(name)
+    _settings[name] = new_value
+    with open(settings_path, 'w') as settings_file:
+        json.dump(_settings, settings_file, indent=4)
@@ -0,0 +1,147 @@
+import threading
+from PyQt5 import QtCore as qtc
+import models
+
+
+class Task(qtc.QObject):
+    """
+    A unit of work run on the TaskManager's thread pool.
+
+    The work function is called on a pool thread as fn(task, *args) and
+    can call task.report_progress() and check task.is_cancelled(). Its
+    result is delivered on the GUI thread through the finished or failed
+    signal, and never once the task has been cancelled. ended is emitted
+    on the GUI thread once the pool has finished with the task.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    FINISHED = 'finished'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    finished = qtc.pyqtSignal(object)
+    failed = qtc.pyqtSignal(object)
+    progress = qtc.pyqtSignal(int, int, str)
+    status_changed = qtc.pyqtSignal(str)
+    ended = qtc.pyqtSignal()
+    _started = qtc.pyqtSignal()
+    _done = qtc.pyqtSignal(object, object)
+
+    def __init__(self, name, fn, args=(), group=None):
+        super().__init__()
+        self.name = name
+        self.fn = fn
+        self.args = args
+        self.group = group
+        self.status = Task.PENDING
+        self._cancelled = threading.Event()
+        self._started.connect(self._mark_running)
+        self._done.connect(self._deliver)
+
+    def cancel(self):
+        self._cancelled.set()
+        if self.status in (Task.PENDING, Task.RUNNING):
+            self._set_status(Task.CANCELLED)
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def report_progress(self, done, total, message=""):
+        if not self.is_cancelled():
+            self.progress.emit(done, total, message)
+
+    def run(self):
+        """Run the work function. Called on a pool thread."""
+        if self.is_cancelled():
+            self._done.emit(None, None)
+            return
+        self._started.emit()
+        result = error = None
+        try:
+            result = self.fn(self, *self.args)
+        except Exception as e:
+            error = e
+        finally:
+            # Pool threads are reused, so don't leave a connection open on them
+            models.database.close()
+        self._done.emit(result, error)
+
+    def _mark_running(self):
+        if not self.is_cancelled():
+            self._set_status(Task.RUNNING)
+
+    def _deliver(self, result, error):
+        if not self.is_cancelled():
+            if error is None:
+                self._set_status(Task.FINISHED)
+                self.finished.emit(result)
+            else:
+                self._set_status(Task.FAILED)
+                self.failed.emit(error)
+        self.ended.emit()
+
+    def _set_status(self, status):
+        self.status = status
+        self.status_changed.emit(status)
+
+
+class _TaskRunnable(qtc.QRunnable):
+
+    def __init__(self, task):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.task = task
+
+    def run(self):
+        try:
+            self.task.run()
+        except RuntimeError:
+            # The app quit while the task was running and its Task has been deleted.
+            # Letting the error out of a QRunnable would abort the process.
+            pass
+
+
+class TaskManager(qtc.QObject):
+    """
+    Runs Tasks on a thread pool and keeps track of them until they are
+    done. Tasks can be put in a group so everything started by one view
+    can be cancelled when the user leaves it.
+    """
+    task_status_changed = qtc.pyqtSignal(object)
+
+    def __init__(self, max_threads=8, parent=None):
+        super().__init__(parent)
+        self.pool = qtc.QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self.tasks = []
+
+    def submit(self, name, fn, *args, group=None, on_finished=None, on_failed=None, on_progress=None):
+        task = Task(name, fn, args, group)
+        if on_finished:
+            task.finished.connect(on_finished)
+        if on_failed:
+            task.failed.connect(on_failed)
+        if on_progress:
+            task.progress.connect(on_progress)
+        task.status_changed.connect(lambda status: self.task_status_changed.emit(task))
+        task.ended.connect(lambda: self.tasks.remove(task))
+        self.tasks.append(task)
+        # Keep a reference to the runnable so Python doesn't collect it while queued
+        task.runnable = _TaskRunnable(task)
+        self.pool.start(task.runnable)
+        return task
+
+    def cancel_group(self, group):
+        for task in self.tasks:
+            if task.group == group:
+                task.cancel()
+
+    def cancel_all(self):
+        # Tasks still waiting for a thread are never started
+        self.pool.clear()
+        for task in self.tasks:
+            task.cancel()
+
+    def running(self, group=None):
+        return [task for task in self.tasks
+                if task.status in (Task.PENDING, Task.RUNNING) and (group is None or task.group == group)]